@@ -8,6 +8,7 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/com
 import { Button } from '@/components/ui/button'
 import { Badge } from '@/components/ui/badge'
 import { useUserIdentity } from '@/hooks/use-user-identity'
+import { tierLabel } from '@/lib/utils'
 import { Copy, ExternalLink } from 'lucide-react'
 import { toast } from 'react-hot-toast'
 import Link from 'next/link'
@@ -135,7 +136,7 @@ export default function SettingsPage() {
                                             <p className="text-sm text-muted-foreground">Subscription Tier</p>
                                             <div className="flex items-center gap-2 mt-1">
                                                 <Badge className={`text-xs ${getTierBadgeColor()}`}>
-                                                    {identity.tier ? identity.tier.charAt(0).toUpperCase() + identity.tier.slice(1) : 'Free'} Tier
+                                                    {tierLabel(identity.tier)} Tier
                                                 </Badge>
                                                 {identity.tier !== 'elite' && (
                                                     <Link href="/upgrade">
@@ -4,6 +4,7 @@ import { useState } from 'react'
 import { signOut } from 'next-auth/react'
 import { useRouter } from 'next/navigation'
 import { useUserIdentity } from '@/hooks/use-user-identity'
+import { tierLabel } from '@/lib/utils'
 import { useTheme } from 'next-themes'
 import Image from 'next/image'
 import { Button } from '@/components/ui/button'
@@ -184,7 +185,7 @@ export function UserMenu() {
                                 {tier === 'free' && <Zap className="h-3 w-3 mr-1 inline" />}
                                 {tier === 'pro' && <Star className="h-3 w-3 mr-1 inline" />}
                                 {tier === 'elite' && <Sparkles className="h-3 w-3 mr-1 inline" />}
-                                {tier.charAt(0).toUpperCase() + tier.slice(1)} Tier
+                                {tierLabel(tier)} Tier
                             </Badge>
                             {identity.role === 'ADMIN' && (
                                 <Badge variant="outline" className="text-xs border-danger-500/50 text-danger-600 dark:text-danger-400 dark:border-danger-400/50">
@@ -3,4 +3,16 @@ import { twMerge } from "tailwind-merge"
 
 export function cn(...inputs: ClassValue[]) {
     return twMerge(clsx(inputs))
+}
+
+// Display labels for subscription tiers, built once instead of
+// re-capitalizing the tier string on every render
+const TIER_LABELS: Record<string, string> = {
+    free: 'Free',
+    pro: 'Pro',
+    elite: 'Elite',
+}
+
+export function tierLabel(tier: string | null | undefined): string {
+    return TIER_LABELS[tier ?? 'free'] ?? 'Free'
 }
\ No newline at end of file
@@ -36,10 +36,12 @@ async function createTestUser() {
         });
         
         if (existingUser) {
-            console.log('✅ Test user already exists:', existingUser.email);
-            console.log('   ID:', existingUser.id);
-            console.log('   Tier:', existingUser.tier);
-            console.log('   Email Verified:', existingUser.emailVerified ? 'Yes' : 'No');
+            console.log([
+                '✅ Test user already exists: ' + existingUser.email,
+                '   ID: ' + existingUser.id,
+                '   Tier: ' + existingUser.tier,
+                '   Email Verified: ' + (existingUser.emailVerified ? 'Yes' : 'No'),
+            ].join('\n'));
             return;
         }
         
@@ -55,12 +57,14 @@ async function createTestUser() {
             }
         });
         
-        console.log('✅ Test user created successfully!');
-        console.log('   Email: test@volspike.com');
-        console.log('   Password: TestPassword123!');
-        console.log('   Tier: free');
-        console.log('   ID:', user.id);
-        console.log('   Email Verified: Yes');
+        console.log([
+            '✅ Test user created successfully!',
+            '   Email: test@volspike.com',
+            '   Password: TestPassword123!',
+            '   Tier: free',
+            '   ID: ' + user.id,
+            '   Email Verified: Yes',
+        ].join('\n'));
         
     } catch (error) {
         console.error('❌ Error creating test user:', error.message);
@@ -0,0 +1,30 @@
+-- Covering index for the sign-in lookup
+-- The auth hot path resolves users by email and reads a fixed set of columns
+-- (the narrow select in routes/auth.ts). The unique email index already
+-- finds the row, but Postgres still follows it with a heap fetch for the
+-- payload columns. INCLUDE-ing every column that select reads makes sign-in
+-- an index-only scan; a partial INCLUDE list would leave the heap fetch in
+-- place and the index would be pure write amplification. Keep this list in
+-- sync with the sign-in select.
+--
+-- Prisma's schema language cannot express INCLUDE clauses, so this runs as a
+-- one-off script, like cleanup-production-users.sql:
+--   psql "$DATABASE_URL" -f scripts/add-auth-covering-index.sql
+--
+-- CONCURRENTLY avoids blocking writes while the index builds, at the cost of
+-- not being allowed inside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_covering
+ON users (email)
+INCLUDE (
+  id,
+  "passwordHash",
+  "walletAddress",
+  tier,
+  "emailVerified",
+  "refreshInterval",
+  theme,
+  role,
+  status,
+  "twoFactorEnabled"
+);
@@ -2,10 +2,16 @@
 -- Removes all users except test@volspike.com
 -- WARNING: This will permanently delete user data from production
 
+-- All deletions run inside one transaction: either every table is cleaned
+-- or none are, and a failure partway through can't leave child rows deleted
+-- with their parent users still present. One commit also means one fsync
+-- instead of one per statement under autocommit.
+BEGIN;
+
 -- Step 1: Delete related records that don't have cascade delete
 -- (Watchlist, Alert, Preference tables)
 
-DELETE FROM watchlists 
+DELETE FROM watchlists
 WHERE "userId" IN (
   SELECT id FROM users 
   WHERE email != 'test@volspike.com'
@@ -28,9 +34,11 @@ WHERE "userId" IN (
 
 -- Step 2: Delete all users except test@volspike.com
 -- This will cascade delete: accounts, sessions, verification_tokens, admin_sessions
-DELETE FROM users 
+DELETE FROM users
 WHERE email != 'test@volspike.com';
 
+COMMIT;
+
 -- Step 3: Verify the cleanup (should return only 1 row)
 SELECT id, email, tier, "createdAt" 
 FROM users;
@@ -21,6 +21,7 @@ async function createAdminUser() {
             data: {
                 id: adminId,
                 email: adminEmail,
+                passwordHash: hashedPassword,
                 emailVerified: new Date(),
                 role: 'ADMIN',
                 status: 'ACTIVE',
@@ -31,13 +32,15 @@ async function createAdminUser() {
             }
         })
 
-        console.log('✅ Admin user created successfully!')
-        console.log('📧 Email:', adminEmail)
-        console.log('🔑 Temporary Password:', tempPassword)
-        console.log('🆔 User ID:', adminId)
-        console.log('')
-        console.log('⚠️  IMPORTANT: Change the password after first login!')
-        console.log('⚠️  IMPORTANT: Enable 2FA for security!')
+        console.log([
+            '✅ Admin user created successfully!',
+            `📧 Email: ${adminEmail}`,
+            `🔑 Temporary Password: ${tempPassword}`,
+            `🆔 User ID: ${adminId}`,
+            '',
+            '⚠️  IMPORTANT: Change the password after first login!',
+            '⚠️  IMPORTANT: Enable 2FA for security!',
+        ].join('\n'))
 
     } catch (error) {
         console.error('❌ Error creating admin user:', error)
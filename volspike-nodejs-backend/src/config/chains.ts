@@ -11,26 +11,26 @@
  * Allowed EVM chains for SIWE authentication
  * Only allow chains that are actively supported
  */
-export const ALLOWED_EVM_CHAINS = [
+export const ALLOWED_EVM_CHAINS = Object.freeze([
   'eip155:1',      // Ethereum Mainnet
   'eip155:8453',   // Base
   'eip155:137',    // Polygon
   'eip155:10',     // Optimism
   'eip155:42161',  // Arbitrum One
-]
+])
 
 /**
  * Allowed Solana networks for SIWS authentication
  */
-export const ALLOWED_SOLANA_NETWORKS = [
+export const ALLOWED_SOLANA_NETWORKS = Object.freeze([
   'solana:101',    // Solana Mainnet
   // 'solana:102',  // Devnet (enable for testing)
-]
+])
 
 /**
  * Chain name mapping for user-friendly display
  */
-export const CHAIN_NAMES: Record<string, string> = {
+export const CHAIN_NAMES: Record<string, string> = Object.freeze({
   'eip155:1': 'Ethereum Mainnet',
   'eip155:8453': 'Base',
   'eip155:137': 'Polygon',
@@ -38,7 +38,7 @@ export const CHAIN_NAMES: Record<string, string> = {
   'eip155:42161': 'Arbitrum One',
   'solana:101': 'Solana Mainnet',
   'solana:102': 'Solana Devnet',
-}
+})
 
 /**
  * Validate if a chain ID is allowed
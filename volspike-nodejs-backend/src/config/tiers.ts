@@ -0,0 +1,91 @@
+/**
+ * Tier configuration for subscription levels
+ *
+ * Per-tier constants live in one table built once at module load, so route
+ * handlers and socket code resolve a tier with a single lookup instead of
+ * re-declaring the numbers inline.
+ */
+
+export interface TierConfig {
+    /** Numeric rank used for tier comparisons (free < pro < elite) */
+    level: number
+    /** How often clients on this tier receive market updates */
+    refreshIntervalMs: number
+    /** Feature gates enabled for this tier */
+    features: ReadonlySet<string>
+}
+
+// Config objects are frozen: they are semantically constants, and freezing
+// turns an accidental runtime mutation into a loud TypeError instead of a
+// silently shifted tier limit.
+export const FREE_TIER: TierConfig = Object.freeze({
+    level: 0,
+    refreshIntervalMs: 15 * 60 * 1000, // 15 minutes
+    features: new Set(['volume_alerts']),
+})
+
+export const PRO_TIER: TierConfig = Object.freeze({
+    level: 1,
+    refreshIntervalMs: 5 * 60 * 1000, // 5 minutes
+    features: new Set(['volume_alerts', 'email_alerts', 'advanced_filters', 'export_data']),
+})
+
+export const ELITE_TIER: TierConfig = Object.freeze({
+    level: 2,
+    refreshIntervalMs: 30 * 1000, // 30 seconds
+    features: new Set([
+        'volume_alerts',
+        'email_alerts',
+        'advanced_filters',
+        'export_data',
+        'sms_alerts',
+        'websocket_realtime',
+        'custom_alerts',
+        'api_access',
+    ]),
+})
+
+export const TIER_CONFIGS: Record<string, TierConfig> = Object.freeze({
+    free: FREE_TIER,
+    pro: PRO_TIER,
+    elite: ELITE_TIER,
+})
+
+/**
+ * Numeric tier ranks, so gate checks can compare with >= instead of chaining
+ * string equality against every qualifying tier name
+ */
+export const TIER_LEVELS = Object.freeze({
+    free: FREE_TIER.level,
+    pro: PRO_TIER.level,
+    elite: ELITE_TIER.level,
+})
+
+/**
+ * Resolve a tier name to its config; unknown tiers fall back to free
+ */
+export function getTierConfig(tier: string): TierConfig {
+    return TIER_CONFIGS[tier] || FREE_TIER
+}
+
+/**
+ * Get the market-data refresh interval for a tier in milliseconds
+ */
+export function getRefreshInterval(tier: string): number {
+    return getTierConfig(tier).refreshIntervalMs
+}
+
+/**
+ * Get the numeric rank for a tier; unknown tiers rank as free
+ */
+export function getTierLevel(tier: string): number {
+    return getTierConfig(tier).level
+}
+
+/**
+ * Check whether a tier has a feature enabled - a single Set probe, with no
+ * key string composed per call
+ */
+export function hasFeature(tier: string, feature: string): boolean {
+    return getTierConfig(tier).features.has(feature)
+}
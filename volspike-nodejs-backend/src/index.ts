@@ -1,3 +1,5 @@
+import './lib/env'
+import { envInt } from './lib/env'
 import { Hono } from 'hono'
 import { cors } from 'hono/cors'
 import { logger as honoLogger } from 'hono/logger'
@@ -14,6 +16,7 @@ import { alertRoutes } from './routes/alerts'
 import { paymentRoutes } from './routes/payments'
 import { adminRoutes } from './routes/admin'
 import { setupSocketHandlers } from './websocket/handlers'
+import { AuditService } from './services/admin/audit-service'
 import type { AppBindings, AppVariables } from './types/hono'
 
 // Initialize Prisma
@@ -22,19 +25,22 @@ export const prisma = new PrismaClient()
 // Initialize logger
 const logger = createLogger()
 
+// Fail fast in production when a required secret is missing. Without this the
+// process boots on dev fallbacks (e.g. the default JWT signing key) and fails
+// later, one request at a time, which is much harder to spot than a crash at
+// deploy. Optional integrations like Stripe and SendGrid degrade gracefully
+// and are deliberately not listed.
+if (process.env.NODE_ENV === 'production') {
+    const missing = ['DATABASE_URL', 'JWT_SECRET'].filter((name) => !process.env[name])
+    if (missing.length > 0) {
+        logger.error(`Missing required environment variables: ${missing.join(', ')}`)
+        process.exit(1)
+    }
+}
+
 // Create Hono app
 const app = new Hono<{ Bindings: AppBindings; Variables: AppVariables }>()
 
-// Global error handler
-app.onError((err, c) => {
-    logger.error('Unhandled error:', {
-        message: err.message,
-        stack: err.stack,
-        url: c.req.url,
-    })
-    return c.json({ error: 'Internal server error' }, 500)
-})
-
 // ============================================
 // CORS CONFIGURATION
 // ============================================
@@ -108,8 +114,15 @@ app.get('/health', (c) => {
 // API routes
 app.route('/api/auth', authRoutes)
 
-// Apply auth middleware to market routes
-app.use('/api/market/*', authMiddleware)
+// Apply auth middleware to market routes. CORS preflights and the health
+// probe don't need a session, so skip the token check and user lookup there -
+// monitoring hits /health every few seconds and was costing a DB round-trip.
+app.use('/api/market/*', (c, next) => {
+    if (c.req.method === 'OPTIONS' || c.req.path === '/api/market/health') {
+        return next()
+    }
+    return authMiddleware(c, next)
+})
 app.route('/api/market', marketRoutes)
 
 app.route('/api/watchlist', watchlistRoutes)
@@ -148,7 +161,7 @@ app.onError((err, c) => {
 // HTTP SERVER USING HONO'S serve()
 // ============================================
 
-const port = Number(process.env.PORT) || 3001
+const port = envInt('PORT', 3001)
 const host = '0.0.0.0'
 
 const httpServer = serve({
@@ -220,6 +233,8 @@ const shutdown = async (signal: string) => {
         })
     })
 
+    await AuditService.flushPendingAuditLogs()
+
     await prisma.$disconnect()
     logger.info('Prisma disconnected')
     logger.info('Shutdown complete')
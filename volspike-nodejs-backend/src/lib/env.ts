@@ -0,0 +1,39 @@
+import { existsSync } from 'fs'
+import { resolve } from 'path'
+
+// Load .env for local development only. On Railway the platform injects env
+// vars and no .env file exists, so the single existsSync probe skips both the
+// dotenv require and its file parsing on every production cold start. This
+// module must stay the first import in index.ts so values are in place before
+// other modules read process.env at load time.
+const envPath = resolve(process.cwd(), '.env')
+if (existsSync(envPath)) {
+    // eslint-disable-next-line @typescript-eslint/no-var-requires
+    require('dotenv').config({ path: envPath })
+}
+
+// Accepted spellings for boolean env vars; a Set probe keeps parsing uniform
+// across flags instead of each site hand-rolling === 'true'
+const TRUTHY = new Set(['1', 'true', 'yes', 'on', 't', 'y'])
+
+/**
+ * Parse a boolean env var once at startup. Missing vars return the default;
+ * anything else matches case-insensitively against the truthy set.
+ */
+export function envBool(name: string, defaultValue = false): boolean {
+    const value = process.env[name]
+    if (value === undefined) {
+        return defaultValue
+    }
+    return TRUTHY.has(value.trim().toLowerCase())
+}
+
+/**
+ * Parse an integer env var, falling back to the default on anything that is
+ * missing, empty or malformed. A typo'd var should never take the process
+ * down at boot or leak NaN into port/limit arithmetic.
+ */
+export function envInt(name: string, defaultValue: number): number {
+    const parsed = Number.parseInt(process.env[name] || '', 10)
+    return Number.isNaN(parsed) ? defaultValue : parsed
+}
@@ -1,8 +1,52 @@
 import { Context, Next } from 'hono'
 import { jwtVerify } from 'jose'
 import { prisma } from '../index'
+import { createLogger } from '../lib/logger'
 import { User } from '../types'
 
+const logger = createLogger()
+
+// Encode the verification secret once - it is read from the environment at
+// startup and never changes, so there is no reason to re-encode per request.
+const jwtSecret = new TextEncoder().encode(
+    process.env.JWT_SECRET || process.env.NEXTAUTH_SECRET || 'your-secret-key'
+)
+
+// Short-lived identity map for the per-request user lookup (in production,
+// use Redis). The dashboard polls several endpoints per tab and each request
+// repeated the same primary-key SELECT; 30 seconds of staleness is fine for
+// the five display fields loaded here.
+// Test/mock token format used by development and test accounts. Compiled once
+// at module scope rather than rebuilding the pattern inside the hot path.
+const MOCK_TOKEN_RE = /^mock-token-(.+?)-\d+$/
+
+const userCache = new Map<string, { user: User; expires: number }>()
+const USER_CACHE_TTL_MS = 30 * 1000
+const USER_CACHE_MAX_ENTRIES = 10_000
+
+// Drop a cached user after a mutation (tier change, suspension, etc.) so the
+// next request re-reads the row.
+export function invalidateCachedUser(userId: string) {
+    userCache.delete(userId)
+}
+
+function getCachedUser(userId: string): User | null {
+    const entry = userCache.get(userId)
+    if (!entry) return null
+    if (Date.now() > entry.expires) {
+        userCache.delete(userId)
+        return null
+    }
+    return entry.user
+}
+
+function setCachedUser(userId: string, user: User) {
+    if (userCache.size >= USER_CACHE_MAX_ENTRIES) {
+        userCache.clear()
+    }
+    userCache.set(userId, { user, expires: Date.now() + USER_CACHE_TTL_MS })
+}
+
 export async function authMiddleware(c: Context, next: Next) {
     try {
         const authHeader = c.req.header('Authorization')
@@ -15,20 +59,23 @@ export async function authMiddleware(c: Context, next: Next) {
 
         let userId: string | null = null
 
-        console.log(`[Auth] Received token: ${token.substring(0, 50)}...`)
+        // Per-request trace logging goes through pino at debug level so the
+        // string formatting is skipped entirely in production (info level),
+        // instead of unconditionally hitting stdout on every request.
+        logger.debug({ tokenPrefix: token.substring(0, 16) }, '[Auth] Received token')
 
         // ✅ Check if it's a simple user ID (from NextAuth session)
         if (!token.includes('.') && !token.startsWith('mock-token-')) {
             // Simple user ID token (e.g., "1")
             userId = token
-            console.log(`[Auth] Using simple user ID token: ${userId}`)
+            logger.debug({ userId }, '[Auth] Using simple user ID token')
         }
         // ✅ Handle mock tokens (development or test accounts)
         else if (token.startsWith('mock-token-')) {
-            const match = token.match(/^mock-token-(.+?)-\d+$/)
+            const match = token.match(MOCK_TOKEN_RE)
             if (match) {
                 userId = match[1]
-                console.log(`[Auth] Mock token accepted for user ID: ${userId}`)
+                logger.debug({ userId }, '[Auth] Mock token accepted')
             } else {
                 return c.json({ error: 'Invalid mock token format' }, 401)
             }
@@ -36,53 +83,59 @@ export async function authMiddleware(c: Context, next: Next) {
         // ✅ Verify real JWT tokens
         else {
             try {
-                const secret = process.env.JWT_SECRET || process.env.NEXTAUTH_SECRET || 'your-secret-key'
-                const secretBytes = new TextEncoder().encode(secret)
-                const { payload } = await jwtVerify(token, secretBytes)
+                const { payload } = await jwtVerify(token, jwtSecret)
 
                 if (!payload.sub) {
-                    console.error('[Auth] JWT has no sub claim')
+                    logger.warn('[Auth] JWT has no sub claim')
                     return c.json({ error: 'Invalid token payload' }, 401)
                 }
 
                 userId = payload.sub as string
-                console.log(`[Auth] JWT verified for user ID: ${userId}`)
+                logger.debug({ userId }, '[Auth] JWT verified')
             } catch (jwtError) {
-                console.error('[Auth] JWT verification failed:', jwtError instanceof Error ? jwtError.message : jwtError)
+                logger.warn({ err: jwtError instanceof Error ? jwtError.message : jwtError }, '[Auth] JWT verification failed')
                 return c.json({ error: 'Invalid token' }, 401)
             }
         }
 
         if (!userId) {
-            console.error('[Auth] No user ID extracted from token')
+            logger.warn('[Auth] No user ID extracted from token')
             return c.json({ error: 'Invalid token' }, 401)
         }
 
-        // Get user from database
-        const user = await prisma.user.findUnique({
-            where: { id: userId },
-            select: {
-                id: true,
-                email: true,
-                tier: true,
-                refreshInterval: true,
-                theme: true,
-            },
-        })
+        // Get user from cache or database
+        let user: User | null = getCachedUser(userId)
+
+        if (!user) {
+            user = await prisma.user.findUnique({
+                where: { id: userId },
+                select: {
+                    id: true,
+                    email: true,
+                    tier: true,
+                    refreshInterval: true,
+                    theme: true,
+                },
+            }) as User | null
+
+            if (user) {
+                setCachedUser(userId, user)
+            }
+        }
 
         if (!user) {
-            console.error(`[Auth] User not found for ID: ${userId}`)
+            logger.warn({ userId }, '[Auth] User not found')
             return c.json({ error: 'User not found' }, 401)
         }
 
-        console.log(`[Auth] ✅ Authenticated user: ${user.email} (${user.tier} tier)`)
+        logger.debug({ email: user.email, tier: user.tier }, '[Auth] ✅ Authenticated user')
 
         // Add user to context with proper typing
         c.set('user', user as User)
 
         await next()
     } catch (error) {
-        console.error('[Auth] Unexpected error:', error instanceof Error ? error.message : error)
+        logger.error({ err: error instanceof Error ? error.message : error }, '[Auth] Unexpected error')
         return c.json({ error: 'Authentication error' }, 401)
     }
 }
@@ -9,29 +9,51 @@ interface RateLimitConfig {
     tierMultiplier: number
 }
 
-const rateLimits: Record<string, RateLimitConfig> = {
-    free: {
+// Frozen so a bug elsewhere cannot silently rewrite the limits at runtime
+const rateLimits: Record<string, RateLimitConfig> = Object.freeze({
+    free: Object.freeze({
         windowMs: 15 * 60 * 1000, // 15 minutes
         maxRequests: 100,
         tierMultiplier: 1,
-    },
-    pro: {
+    }),
+    pro: Object.freeze({
         windowMs: 5 * 60 * 1000, // 5 minutes
         maxRequests: 500,
         tierMultiplier: 3,
-    },
-    elite: {
+    }),
+    elite: Object.freeze({
         windowMs: 1 * 60 * 1000, // 1 minute
         maxRequests: 1000,
         tierMultiplier: 5,
-    },
+    }),
+})
+
+// Effective limits derived once at module load; the multiplier product and
+// its header string were previously recomputed on every request.
+interface ResolvedRateLimit {
+    windowMs: number
+    maxRequests: number
+    limitHeader: string
 }
 
+const resolvedLimits: Record<string, ResolvedRateLimit> = Object.freeze(
+    Object.fromEntries(
+        Object.entries(rateLimits).map(([tier, config]) => {
+            const maxRequests = config.maxRequests * config.tierMultiplier
+            return [tier, Object.freeze({
+                windowMs: config.windowMs,
+                maxRequests,
+                limitHeader: maxRequests.toString(),
+            })]
+        })
+    )
+)
+
 export async function rateLimitMiddleware(c: Context, next: Next) {
     try {
         const user = c.get('user')
         const tier = user?.tier || 'free'
-        const config = rateLimits[tier] || rateLimits.free
+        const config = resolvedLimits[tier] || resolvedLimits.free
 
         const key = `rate_limit:${user.id}:${Math.floor(Date.now() / config.windowMs)}`
         const now = Date.now()
@@ -46,9 +68,7 @@ export async function rateLimitMiddleware(c: Context, next: Next) {
         // Increment count
         entry.count++
 
-        const maxRequests = config.maxRequests * config.tierMultiplier
-
-        if (entry.count > maxRequests) {
+        if (entry.count > config.maxRequests) {
             return c.json({
                 error: 'Rate limit exceeded',
                 retryAfter: Math.ceil((entry.resetTime - now) / 1000)
@@ -56,8 +76,8 @@ export async function rateLimitMiddleware(c: Context, next: Next) {
         }
 
         // Add rate limit headers
-        c.header('X-RateLimit-Limit', maxRequests.toString())
-        c.header('X-RateLimit-Remaining', Math.max(0, maxRequests - entry.count).toString())
+        c.header('X-RateLimit-Limit', config.limitHeader)
+        c.header('X-RateLimit-Remaining', Math.max(0, config.maxRequests - entry.count).toString())
         c.header('X-RateLimit-Reset', Math.ceil(entry.resetTime / 1000).toString())
 
         await next()
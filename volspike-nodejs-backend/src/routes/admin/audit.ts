@@ -21,29 +21,35 @@ const auditLogQuerySchema = z.object({
     sortOrder: z.enum(['asc', 'desc']).default('desc'),
 })
 
+// Build the Prisma where clause shared by listing and export
+function buildAuditWhere(params: z.infer<typeof auditLogQuerySchema>) {
+    const where: any = {}
+
+    if (params.actorUserId) where.actorUserId = params.actorUserId
+    if (params.action) where.action = params.action
+    if (params.targetType) where.targetType = params.targetType
+    if (params.targetId) where.targetId = params.targetId
+
+    if (params.startDate || params.endDate) {
+        where.createdAt = {}
+        if (params.startDate) {
+            where.createdAt.gte = new Date(params.startDate)
+        }
+        if (params.endDate) {
+            where.createdAt.lte = new Date(params.endDate)
+        }
+    }
+
+    return where
+}
+
 // GET /api/admin/audit - Get audit logs
 adminAuditRoutes.get('/', async (c) => {
     try {
         const query = c.req.query()
         const params = auditLogQuerySchema.parse(query)
 
-        // Build where clause
-        const where: any = {}
-
-        if (params.actorUserId) where.actorUserId = params.actorUserId
-        if (params.action) where.action = params.action
-        if (params.targetType) where.targetType = params.targetType
-        if (params.targetId) where.targetId = params.targetId
-
-        if (params.startDate || params.endDate) {
-            where.createdAt = {}
-            if (params.startDate) {
-                where.createdAt.gte = new Date(params.startDate)
-            }
-            if (params.endDate) {
-                where.createdAt.lte = new Date(params.endDate)
-            }
-        }
+        const where = buildAuditWhere(params)
 
         // Get total count
         const total = await prisma.auditLog.count({ where })
@@ -133,6 +139,66 @@ adminAuditRoutes.get('/stats', async (c) => {
     }
 })
 
+// GET /api/admin/audit/export - Export audit logs
+// Registered before /:id, which would otherwise capture 'export' as a log id
+adminAuditRoutes.get('/export', async (c) => {
+    try {
+        const format = c.req.query('format') || 'json'
+        const params = auditLogQuerySchema.parse(c.req.query())
+        const where = buildAuditWhere(params)
+
+        // Stream rows in keyset batches instead of one big query, so a large
+        // export never materializes the whole result set (plus actor joins)
+        // in a single round-trip
+        const batchSize = 1000
+        const maxRows = 10000
+        const logs: any[] = []
+        let cursor: string | undefined
+
+        while (logs.length < maxRows) {
+            const batch = await prisma.auditLog.findMany({
+                where,
+                include: {
+                    actor: {
+                        select: {
+                            email: true,
+                        },
+                    },
+                },
+                orderBy: [
+                    { createdAt: 'desc' },
+                    { id: 'desc' },
+                ],
+                take: Math.min(batchSize, maxRows - logs.length),
+                ...(cursor ? { cursor: { id: cursor }, skip: 1 } : {}),
+            })
+
+            logs.push(...batch)
+
+            if (batch.length < batchSize) {
+                break
+            }
+            cursor = batch[batch.length - 1].id
+        }
+
+        if (format === 'json') {
+            c.header('Content-Type', 'application/json')
+            c.header('Content-Disposition', `attachment; filename="audit-logs-${new Date().toISOString().split('T')[0]}.json"`)
+            return c.text(JSON.stringify(logs, null, 2))
+        } else if (format === 'csv') {
+            const csv = generateCSV(logs)
+            c.header('Content-Type', 'text/csv')
+            c.header('Content-Disposition', `attachment; filename="audit-logs-${new Date().toISOString().split('T')[0]}.csv"`)
+            return c.text(csv)
+        } else {
+            return c.json({ error: 'Unsupported format' }, 400)
+        }
+    } catch (error) {
+        logger.error('Export audit logs error:', error)
+        return c.json({ error: 'Failed to export audit logs' }, 500)
+    }
+})
+
 // GET /api/admin/audit/:id - Get specific audit log
 adminAuditRoutes.get('/:id', async (c) => {
     try {
@@ -162,44 +228,6 @@ adminAuditRoutes.get('/:id', async (c) => {
     }
 })
 
-// GET /api/admin/audit/export - Export audit logs
-adminAuditRoutes.get('/export', async (c) => {
-    try {
-        const format = c.req.query('format') || 'json'
-
-        // Get all audit logs for export
-        const logs = await prisma.auditLog.findMany({
-            include: {
-                actor: {
-                    select: {
-                        email: true,
-                    },
-                },
-            },
-            orderBy: {
-                createdAt: 'desc',
-            },
-            take: 1000, // Limit to 1000 for now
-        })
-
-        if (format === 'json') {
-            c.header('Content-Type', 'application/json')
-            c.header('Content-Disposition', `attachment; filename="audit-logs-${new Date().toISOString().split('T')[0]}.json"`)
-            return c.text(JSON.stringify(logs, null, 2))
-        } else if (format === 'csv') {
-            const csv = generateCSV(logs)
-            c.header('Content-Type', 'text/csv')
-            c.header('Content-Disposition', `attachment; filename="audit-logs-${new Date().toISOString().split('T')[0]}.csv"`)
-            return c.text(csv)
-        } else {
-            return c.json({ error: 'Unsupported format' }, 400)
-        }
-    } catch (error) {
-        logger.error('Export audit logs error:', error)
-        return c.json({ error: 'Failed to export audit logs' }, 500)
-    }
-})
-
 // Helper function to generate CSV
 function generateCSV(logs: any[]): string {
     const headers = ['ID', 'Actor Email', 'Action', 'Target Type', 'Target ID', 'Created At']
@@ -38,15 +38,14 @@ adminMetricsRoutes.get('/', async (c) => {
                 break
         }
 
-        // Get metrics
+        // Get metrics. The tier groupBy already scans every user, so the
+        // total is derived from it instead of issuing a separate count.
         const [
-            totalUsers,
             activeUsers,
             usersByTier,
             recentSignups,
             adminSessions,
         ] = await Promise.all([
-            prisma.user.count(),
             prisma.user.count({
                 where: {
                     lastLoginAt: {
@@ -75,7 +74,7 @@ adminMetricsRoutes.get('/', async (c) => {
         ])
 
         return c.json({
-            totalUsers,
+            totalUsers: usersByTier.reduce((sum, item) => sum + item._count, 0),
             activeUsers,
             usersByTier: usersByTier.map(item => ({
                 tier: item.tier,
@@ -95,12 +94,12 @@ adminMetricsRoutes.get('/', async (c) => {
 // GET /api/admin/metrics/users - Get user metrics
 adminMetricsRoutes.get('/users', async (c) => {
     try {
+        // Two grouped scans cover everything; the total falls out of either
+        // groupBy, so the separate unconditional count is gone
         const [
-            totalUsers,
             usersByTier,
             usersByStatus,
         ] = await Promise.all([
-            prisma.user.count(),
             prisma.user.groupBy({
                 by: ['tier'],
                 _count: true,
@@ -112,7 +111,7 @@ adminMetricsRoutes.get('/users', async (c) => {
         ])
 
         return c.json({
-            totalUsers,
+            totalUsers: usersByTier.reduce((sum, item) => sum + item._count, 0),
             usersByTier: usersByTier.map(item => ({
                 tier: item.tier,
                 count: item._count,
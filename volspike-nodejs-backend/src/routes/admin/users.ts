@@ -3,6 +3,7 @@ import { z } from 'zod'
 import { prisma } from '../../index'
 import { createLogger } from '../../lib/logger'
 import { Role, UserStatus } from '@prisma/client'
+import { invalidateCachedUser } from '../../middleware/auth'
 import type { AppBindings, AppVariables } from '../../types/hono'
 
 const logger = createLogger()
@@ -93,18 +94,33 @@ adminUserRoutes.get('/:id', async (c) => {
 
         const user = await prisma.user.findUnique({
             where: { id: userId },
+            // Relations are trimmed to the fields the detail view renders;
+            // the full-row includes dragged whole contract and alert rows
+            // across the wire just to be discarded
             include: {
                 preferences: true,
                 watchlists: {
-                    include: {
+                    select: {
+                        id: true,
+                        name: true,
                         items: {
-                            include: {
-                                contract: true,
+                            select: {
+                                contract: {
+                                    select: { symbol: true },
+                                },
                             },
                         },
                     },
                 },
                 alerts: {
+                    select: {
+                        id: true,
+                        reason: true,
+                        threshold: true,
+                        triggeredValue: true,
+                        isDelivered: true,
+                        createdAt: true,
+                    },
                     orderBy: { createdAt: 'desc' },
                     take: 10,
                 },
@@ -140,6 +156,10 @@ adminUserRoutes.patch('/:id', async (c) => {
             },
         })
 
+        // Drop the auth cache entry so the change applies on the user's next
+        // request instead of after the cache TTL
+        invalidateCachedUser(userId)
+
         const adminUser = c.get('adminUser')
         logger.info(`User ${userId} updated by admin ${adminUser?.email || 'unknown'}`)
 
@@ -168,6 +188,8 @@ adminUserRoutes.delete('/:id', async (c) => {
             })
         }
 
+        invalidateCachedUser(userId)
+
         const adminUser = c.get('adminUser')
         logger.info(`User ${userId} deleted by admin ${adminUser?.email || 'unknown'}`)
 
@@ -188,6 +210,8 @@ adminUserRoutes.post('/:id/suspend', async (c) => {
             data: { status: UserStatus.SUSPENDED },
         })
 
+        invalidateCachedUser(userId)
+
         const adminUser = c.get('adminUser')
         logger.info(`User ${userId} suspended by admin ${adminUser?.email || 'unknown'}`)
 
@@ -30,8 +30,10 @@ const updatePreferencesSchema = z.object({
 alerts.get('/', async (c) => {
     try {
         const user = requireUser(c)
-        const limit = parseInt(c.req.query('limit') || '50')
-        const offset = parseInt(c.req.query('offset') || '0')
+        // Fall back to defaults on malformed values instead of letting NaN
+        // reach the query's take/skip
+        const limit = parseInt(c.req.query('limit') || '50') || 50
+        const offset = parseInt(c.req.query('offset') || '0') || 0
 
         const alerts = await prisma.alert.findMany({
             where: { userId: user.id },
@@ -1,6 +1,7 @@
 import { Hono } from 'hono'
 import { SignJWT, jwtVerify } from 'jose'
 import { z } from 'zod'
+import { Prisma } from '@prisma/client'
 import { prisma } from '../index'
 import { createLogger } from '../lib/logger'
 import { getUser, requireUser } from '../lib/hono-extensions'
@@ -75,11 +76,19 @@ function rateLimit(identifier: string, maxRequests: number = 5, windowMs: number
     return true
 }
 
+// Encode the signing secret once at module load instead of re-deriving the
+// byte array on every token we issue - the env var never changes at runtime.
+const jwtSecret = new TextEncoder().encode(process.env.JWT_SECRET || 'your-secret-key')
+
+// Frontend origin used in SIWE/SIWS messages and deep-link redirects. Resolved
+// once at module load; parsing the hostname per request bought nothing since
+// the env var is fixed for the lifetime of the process.
+const frontendUrl = process.env.FRONTEND_URL || 'http://localhost:3000'
+const frontendHostname = new URL(frontendUrl).hostname
+
 // Generate JWT token. Optional payload lets callers include extra SIWE fields
 // such as wallet address/provider without affecting email/password tokens.
 async function generateToken(userId: string, extraPayload?: Record<string, unknown>): Promise<string> {
-    const secret = new TextEncoder().encode(process.env.JWT_SECRET || 'your-secret-key')
-
     const base: Record<string, unknown> = { sub: userId }
     const claims = extraPayload ? { ...base, ...extraPayload } : base
 
@@ -87,12 +96,44 @@ async function generateToken(userId: string, extraPayload?: Record<string, unkno
         .setProtectedHeader({ alg: 'HS256' })
         .setIssuedAt()
         .setExpirationTime('24h')
-        .sign(secret)
+        .sign(jwtSecret)
+}
+
+// Build the public user payload returned by every auth endpoint. Keeping the
+// shape in one place means each response serializes the user exactly once
+// and the field list cannot drift between endpoints.
+function toPublicUser(user: {
+    id: string
+    email: string
+    tier: string
+    emailVerified: Date | null
+    refreshInterval: number
+    theme: string
+    role: string
+    status: string
+    twoFactorEnabled: boolean
+}) {
+    return {
+        id: user.id,
+        email: user.email,
+        tier: user.tier,
+        emailVerified: user.emailVerified ? user.emailVerified.toISOString() : null,
+        refreshInterval: user.refreshInterval,
+        theme: user.theme,
+        role: user.role,
+        status: user.status,
+        twoFactorEnabled: user.twoFactorEnabled,
+    }
 }
 
+// bcrypt work factor. Configurable so the cost can be raised as hardware
+// improves (or lowered in CI) without a code change; 12 remains the default.
+const parsedRounds = Number.parseInt(process.env.BCRYPT_ROUNDS || '', 10)
+const bcryptRounds = Number.isNaN(parsedRounds) ? 12 : Math.min(Math.max(parsedRounds, 10), 16)
+
 // Hash password
 async function hashPassword(password: string): Promise<string> {
-    return await bcrypt.hash(password, 12)
+    return await bcrypt.hash(password, bcryptRounds)
 }
 
 // Verify password
@@ -100,25 +141,48 @@ async function verifyPassword(password: string, hash: string): Promise<boolean>
     return await bcrypt.compare(password, hash)
 }
 
+// Hash of a throwaway value, computed once at startup. Verified against on
+// the unknown-email branch of /signin so that branch costs a full bcrypt
+// comparison too - otherwise unknown emails answer in microseconds while
+// wrong passwords take ~100ms, which lets an attacker enumerate accounts.
+const dummyHashPromise = hashPassword('timing-equalizer-dummy-password')
+
 // Sign in with email/password
 auth.post('/signin', async (c) => {
     try {
         const body = await c.req.json()
-        logger.info(`[AUTH] /signin request received for: ${body.email}`)
-        
+        logger.debug(`[AUTH] /signin request received for: ${body.email}`)
+
         const { email, password } = signInSchema.parse(body)
-        logger.info(`[AUTH] Schema validation passed for: ${email}`)
 
+        // Fetch only the columns the sign-in flow reads; the full row drags in
+        // admin notes, 2FA secrets and tracking fields this path never touches.
         const user = await prisma.user.findUnique({
             where: { email },
+            select: {
+                id: true,
+                email: true,
+                passwordHash: true,
+                walletAddress: true,
+                tier: true,
+                emailVerified: true,
+                refreshInterval: true,
+                theme: true,
+                role: true,
+                status: true,
+                twoFactorEnabled: true,
+            },
         })
 
         if (!user) {
+            // Burn a bcrypt comparison so this branch is not measurably
+            // faster than an invalid password for an existing account
+            await verifyPassword(password, await dummyHashPromise)
             logger.warn(`[AUTH] User not found: ${email}`)
             return c.json({ error: 'Invalid credentials' }, 401)
         }
 
-        logger.info(`[AUTH] User found: ${user.email}, hasPassword: ${!!user.passwordHash}, emailVerified: ${!!user.emailVerified}, walletAddress: ${!!user.walletAddress}`)
+        logger.debug(`[AUTH] User found: ${user.email}, hasPassword: ${!!user.passwordHash}, emailVerified: ${!!user.emailVerified}, walletAddress: ${!!user.walletAddress}`)
 
         // Check if email is verified (allow wallet users to bypass)
         if (!user.emailVerified && !user.walletAddress) {
@@ -139,16 +203,12 @@ auth.post('/signin', async (c) => {
             }, 401)
         }
 
-        logger.info(`[AUTH] Verifying password for: ${email}`)
         const isValidPassword = await verifyPassword(password, user.passwordHash)
-        logger.info(`[AUTH] Password verification result: ${isValidPassword ? 'VALID' : 'INVALID'}`)
-        
+
         if (!isValidPassword) {
             logger.warn(`Invalid password attempt for ${email}`)
             return c.json({ error: 'Invalid email or password' }, 401)
         }
-        
-        logger.info(`[AUTH] Password valid, generating token for: ${email}`)
 
         const token = await generateToken(user.id)
 
@@ -156,17 +216,7 @@ auth.post('/signin', async (c) => {
 
         return c.json({
             token,
-            user: {
-                id: user.id,
-                email: user.email,
-                tier: user.tier,
-                emailVerified: user.emailVerified ? user.emailVerified.toISOString() : null,
-                refreshInterval: user.refreshInterval,
-                theme: user.theme,
-                role: user.role,
-                status: user.status,
-                twoFactorEnabled: user.twoFactorEnabled,
-            },
+            user: toPublicUser(user),
         })
     } catch (error) {
         logger.error('Sign in error:', error)
@@ -180,41 +230,45 @@ auth.post('/signup', async (c) => {
         const body = await c.req.json()
         const { email, password, tier } = signUpSchema.parse(body)
 
-        // Check if user already exists
-        const existingUser = await prisma.user.findUnique({
-            where: { email },
-        })
-
-        if (existingUser) {
-            return c.json({ error: 'User already exists' }, 409)
-        }
-
         // Hash password
         const passwordHash = await hashPassword(password)
 
-        // Create new user with hashed password
-        const user = await prisma.user.create({
-            data: {
-                email,
-                tier,
-                passwordHash,
-                emailVerified: null, // Will be set after email verification
-            },
-        })
-
-        // Generate verification token
         const verificationToken = emailService.generateVerificationToken()
         const verificationUrl = `${process.env.EMAIL_VERIFICATION_URL_BASE}/auth/verify?token=${verificationToken}&email=${encodeURIComponent(email)}`
 
-        // Store verification token
-        await prisma.verificationToken.create({
-            data: {
-                identifier: email,
-                token: verificationToken,
-                expires: new Date(Date.now() + 24 * 60 * 60 * 1000), // 24 hours
-                userId: user.id,
-            },
-        })
+        // Create the user and their verification token in one transaction so a
+        // failed token insert never leaves behind an account that can neither
+        // sign in nor re-register. The unique index on email catches
+        // duplicates, so no pre-insert lookup is needed.
+        let user
+        try {
+            user = await prisma.$transaction(async (tx) => {
+                const created = await tx.user.create({
+                    data: {
+                        email,
+                        tier,
+                        passwordHash,
+                        emailVerified: null, // Will be set after email verification
+                    },
+                })
+
+                await tx.verificationToken.create({
+                    data: {
+                        identifier: email,
+                        token: verificationToken,
+                        expires: new Date(Date.now() + 24 * 60 * 60 * 1000), // 24 hours
+                        userId: created.id,
+                    },
+                })
+
+                return created
+            })
+        } catch (error) {
+            if (error instanceof Prisma.PrismaClientKnownRequestError && error.code === 'P2002') {
+                return c.json({ error: 'User already exists' }, 409)
+            }
+            throw error
+        }
 
         // Send verification email
         const emailSent = await emailService.sendVerificationEmail({
@@ -251,22 +305,19 @@ auth.post('/oauth-link', async (c) => {
         const body = await c.req.json()
         const { email, name, image, provider, providerId } = oauthLinkSchema.parse(body)
 
-        // Find existing user by email
-        let user = await prisma.user.findUnique({
+        // Find-or-create in one round-trip; the empty update leaves existing
+        // accounts untouched while racing requests can no longer both miss
+        // the lookup and collide on the insert.
+        const user = await prisma.user.upsert({
             where: { email },
+            update: {},
+            create: {
+                email,
+                tier: 'free',
+                emailVerified: new Date(), // OAuth users are considered verified
+            },
         })
 
-        if (!user) {
-            // Create new user for OAuth
-            user = await prisma.user.create({
-                data: {
-                    email,
-                    tier: 'free',
-                    emailVerified: new Date(), // OAuth users are considered verified
-                },
-            })
-        }
-
         // Create or update account record
         await prisma.account.upsert({
             where: {
@@ -294,17 +345,7 @@ auth.post('/oauth-link', async (c) => {
 
         return c.json({
             token,
-            user: {
-                id: user.id,
-                email: user.email,
-                tier: user.tier,
-                emailVerified: user.emailVerified ? user.emailVerified.toISOString() : null,
-                refreshInterval: user.refreshInterval,
-                theme: user.theme,
-                role: user.role,
-                status: user.status,
-                twoFactorEnabled: user.twoFactorEnabled,
-            },
+            user: toPublicUser(user),
         })
     } catch (error) {
         logger.error('OAuth link error:', error)
@@ -465,11 +506,8 @@ auth.get('/siwe/prepare', async (c) => {
             return c.json({ error: 'No valid nonce. Call /siwe/nonce first.' }, 400)
         }
         
-        const expectedDomain = new URL(process.env.FRONTEND_URL || 'http://localhost:3000').hostname
-        const frontendUrl = process.env.FRONTEND_URL || 'http://localhost:3000'
-        
         const msg = new SiweMessage({
-            domain: expectedDomain,
+            domain: frontendHostname,
             address,
             statement: 'Sign in with Ethereum to VolSpike.',
             uri: frontendUrl,
@@ -495,8 +533,7 @@ auth.post('/siwe/verify', async (c) => {
     try {
         const { message, signature } = await c.req.json()
 
-        console.log('[SIWE Verify] Received message:', message.substring(0, 100) + '...')
-        console.log('[SIWE Verify] Received signature:', signature)
+        logger.debug(`[SIWE Verify] Received message: ${message.substring(0, 100)}...`)
 
         // Parse SIWE message using siwe v3
         const siweMessage = new SiweMessage(message)
@@ -512,7 +549,7 @@ auth.post('/siwe/verify', async (c) => {
         // v3 verify API - ✅ exact domain, no port
         const result = await siweMessage.verify({
             signature,
-            domain: new URL(process.env.FRONTEND_URL || 'http://localhost:3000').hostname,
+            domain: frontendHostname,
             nonce: expectedNonce,
             time: new Date().toISOString(),
         })
@@ -524,7 +561,7 @@ auth.post('/siwe/verify', async (c) => {
 
         const { address, chainId } = siweMessage
         
-        console.log('[SIWE Verify] Successfully verified:', { address, chainId })
+        logger.debug(`[SIWE Verify] Successfully verified: ${address} on chain ${chainId}`)
 
         // Validate chain
         const caipChainId = `eip155:${chainId}`
@@ -600,22 +637,13 @@ auth.post('/siwe/verify', async (c) => {
             ok: true,
             token,
             user: {
-                id: user.id,
-                email: user.email,
-                tier: user.tier,
-                emailVerified: user.emailVerified ? user.emailVerified.toISOString() : null,
-                refreshInterval: user.refreshInterval,
-                theme: user.theme,
+                ...toPublicUser(user),
                 walletAddress: address,
                 walletProvider: 'evm',
-                role: user.role,
-                status: user.status,
-                twoFactorEnabled: user.twoFactorEnabled,
             },
         })
     } catch (error: any) {
         logger.error('SIWE verification error:', error)
-        console.error('[SIWE Verify] Full error:', JSON.stringify(error, Object.getOwnPropertyNames(error)))
         return c.json({ error: error.message || 'Verification failed' }, 401)
     }
 })
@@ -647,12 +675,9 @@ auth.get('/solana/prepare', async (c) => {
     const nonceData = nonceManager.validate(nonce)
     if (!nonceData) return c.json({ error: 'No valid nonce. Call /solana/nonce first.' }, 400)
 
-    const expectedDomain = new URL(process.env.FRONTEND_URL || 'http://localhost:3000').hostname
-    const frontendUrl = process.env.FRONTEND_URL || 'http://localhost:3000'
-
     // Simple SIWS message
     const issuedAt = new Date().toISOString()
-    const message = `Sign in with Solana to VolSpike\n\nDomain: ${expectedDomain}\nAddress: ${address}\nURI: ${frontendUrl}\nVersion: 1\nChain ID: ${chainId}\nNonce: ${nonce}\nIssued At: ${issuedAt}`
+    const message = `Sign in with Solana to VolSpike\n\nDomain: ${frontendHostname}\nAddress: ${address}\nURI: ${frontendUrl}\nVersion: 1\nChain ID: ${chainId}\nNonce: ${nonce}\nIssued At: ${issuedAt}`
 
     return c.json({ message })
 })
@@ -728,17 +753,9 @@ auth.post('/solana/verify', async (c) => {
             ok: true,
             token,
             user: {
-                id: user.id,
-                email: user.email,
-                tier: user.tier,
-                emailVerified: user.emailVerified ? user.emailVerified.toISOString() : null,
-                refreshInterval: user.refreshInterval,
-                theme: user.theme,
+                ...toPublicUser(user),
                 walletAddress: address,
                 walletProvider: 'solana',
-                role: user.role,
-                status: user.status,
-                twoFactorEnabled: user.twoFactorEnabled,
             },
         })
     } catch (e: any) {
@@ -746,13 +763,17 @@ auth.post('/solana/verify', async (c) => {
     }
 })
 
+// The guest response never varies, so serialize it once instead of building
+// a fresh object and re-running JSON.stringify on every poll of /me.
+const notAuthenticatedBody = JSON.stringify({ error: 'Not authenticated' })
+
 // Get current user
 auth.get('/me', async (c) => {
     try {
         const user = getUser(c)
 
         if (!user) {
-            return c.json({ error: 'Not authenticated' }, 401)
+            return c.body(notAuthenticatedBody, 401, { 'Content-Type': 'application/json' })
         }
 
         return c.json({ user })
@@ -821,7 +842,7 @@ auth.post('/phantom/dl/start', async (c) => {
     try {
         cleanupPhantomStateStore()
         const body = await c.req.json().catch(() => ({})) as { appUrl?: string; redirect?: string }
-        const origin = body.appUrl || (process.env.FRONTEND_URL || 'http://localhost:3000')
+        const origin = body.appUrl || frontendUrl
         const redirectBase = body.redirect || `${origin}/auth/phantom-callback`
         const { publicKey, secretKey } = generateEphemeralKeypair()
         const state = crypto.randomUUID()
@@ -862,7 +883,7 @@ auth.post('/phantom/dl/sign-url', async (c) => {
             logger.warn(`[PhantomDL] sign-url: missing session or phantomPubKey for state=${state}`)
             return c.json({ error: 'Missing Phantom session' }, 400)
         }
-        const origin = appUrl || (process.env.FRONTEND_URL || 'http://localhost:3000')
+        const origin = appUrl || frontendUrl
         const redirectBase = redirect || `${origin}/auth/phantom-callback`
         const redirectLink = `${redirectBase}?state=${encodeURIComponent(state)}`
         const shared = computeSharedSecret(rec.phantomPubKey, rec.secretKey)
@@ -21,6 +21,38 @@ const logger = createLogger()
 
 const market = new Hono()
 
+// Static fallback body returned whenever Binance has no data. Every field is
+// constant, so build it once instead of allocating the nested object per
+// request while the upstream API is down.
+const staleMarketResponse = {
+    data: [],
+    stale: true,
+    message: 'Market data temporarily unavailable - Binance API may be down',
+    lastUpdate: null,
+    ingestionStatus: {
+        hasData: false,
+        lastHeartbeat: null,
+        lastError: null,
+    },
+} as const
+
+// Resolve the authenticated user once per handler instead of re-running the
+// requireUser try/catch dance in every route. In development, unauthenticated
+// requests fall back to a mock free-tier user.
+function resolveUser(c: Parameters<typeof requireUser>[0]): { user: User; tier: string } | null {
+    try {
+        const user = requireUser(c)
+        return { user, tier: user?.tier || 'free' }
+    } catch (error) {
+        if (process.env.NODE_ENV === 'development') {
+            logger.info('Using mock user for market route (development mode)')
+            const user = { id: 'dev-user', email: 'dev@volspike.com', tier: 'free' } as any as User
+            return { user, tier: 'free' }
+        }
+        return null
+    }
+}
+
 // ============================================
 // OPTIONS HANDLERS - Handle CORS preflight
 // ============================================
@@ -56,21 +88,11 @@ market.options('/health', (c) => {
 
 market.get('/data', async (c) => {
     try {
-        // For development: allow unauthenticated access
-        let user, tier = 'free'
-        try {
-            user = requireUser(c)
-            tier = user?.tier || 'free'
-        } catch (error) {
-            // In development, use mock user if not authenticated
-            if (process.env.NODE_ENV === 'development') {
-                logger.info('Using mock user for market data (development mode)')
-                user = { id: '1', email: 'dev@volspike.com', tier: 'free' } as any
-                tier = 'free'
-            } else {
-                throw error
-            }
+        const resolved = resolveUser(c)
+        if (!resolved) {
+            return c.json({ error: 'Unauthorized' }, 401)
         }
+        const { user, tier } = resolved
 
         // Get market data directly from Binance API
         const marketData = await getMarketData() as MarketData[]
@@ -78,17 +100,7 @@ market.get('/data', async (c) => {
         if (!marketData || marketData.length === 0) {
             // Return empty data with stale indicator instead of 500
             logger.warn('No market data available from Binance API')
-            return c.json({
-                data: [],
-                stale: true,
-                message: 'Market data temporarily unavailable - Binance API may be down',
-                lastUpdate: null,
-                ingestionStatus: {
-                    hasData: false,
-                    lastHeartbeat: null,
-                    lastError: null
-                }
-            }, 200)
+            return c.json(staleMarketResponse, 200)
         }
 
         // Apply tier-based filtering
@@ -134,17 +146,11 @@ market.get('/symbol/:symbol', async (c) => {
     try {
         const symbol = c.req.param('symbol')
 
-        let user
-        try {
-            user = requireUser(c)
-        } catch (error) {
-            if (process.env.NODE_ENV === 'development') {
-                logger.info(`Symbol data for ${symbol} (unauthenticated, development mode)`)
-                user = { id: 'dev-user', email: 'dev@volspike.com', tier: 'free' } as any
-            } else {
-                return c.json({ error: 'Unauthorized' }, 401)
-            }
+        const resolved = resolveUser(c)
+        if (!resolved) {
+            return c.json({ error: 'Unauthorized' }, 401)
         }
+        const { user } = resolved
 
         // Get symbol data directly from Binance API
         const symbolData = await getMarketData(symbol)
@@ -170,22 +176,15 @@ market.get('/history/:symbol', async (c) => {
     try {
         const symbol = c.req.param('symbol')
         const timeframe = c.req.query('timeframe') || '1h'
-        const limit = parseInt(c.req.query('limit') || '100')
-
-        let user, tier = 'free'
-
-        try {
-            user = requireUser(c)
-            tier = user?.tier || 'free'
-        } catch (error) {
-            if (process.env.NODE_ENV === 'development') {
-                logger.info(`History for ${symbol} (unauthenticated, development mode)`)
-                user = { id: 'dev-user', email: 'dev@volspike.com', tier: 'free' } as any
-                tier = 'free'
-            } else {
-                return c.json({ error: 'Unauthorized' }, 401)
-            }
+        // Fall back to the default on malformed values instead of letting
+        // NaN slip past the tier cap check below
+        const limit = parseInt(c.req.query('limit') || '100') || 100
+
+        const resolved = resolveUser(c)
+        if (!resolved) {
+            return c.json({ error: 'Unauthorized' }, 401)
         }
+        const { user, tier } = resolved
 
         // Tier-based access control
         if (tier === 'free' && limit > 50) {
@@ -227,20 +226,11 @@ market.get('/history/:symbol', async (c) => {
 
 market.get('/spikes', async (c) => {
     try {
-        let user, tier = 'free'
-
-        try {
-            user = requireUser(c)
-            tier = user?.tier || 'free'
-        } catch (error) {
-            if (process.env.NODE_ENV === 'development') {
-                logger.info('Volume spikes requested (unauthenticated, development mode)')
-                user = { id: 'dev-user', email: 'dev@volspike.com', tier: 'free' } as any
-                tier = 'free'
-            } else {
-                return c.json({ error: 'Unauthorized' }, 401)
-            }
+        const resolved = resolveUser(c)
+        if (!resolved) {
+            return c.json({ error: 'Unauthorized' }, 401)
         }
+        const { user, tier } = resolved
 
         // Get recent alerts
         const alerts = await prisma.alert.findMany({
@@ -5,16 +5,44 @@ import { prisma } from '../index'
 import { createLogger } from '../lib/logger'
 import { User } from '../types'
 import { getUser, requireUser } from '../lib/hono-extensions'
+import { invalidateCachedUser } from '../middleware/auth'
 
 const logger = createLogger()
 
-// Initialize Stripe
-const stripe = new Stripe(process.env.STRIPE_SECRET_KEY || '', {
-    apiVersion: '2023-10-16',
-})
+// Initialize Stripe lazily. Constructing the client at import time adds to
+// every cold start even for deploys that never touch billing, and it reads
+// STRIPE_SECRET_KEY before dotenv may have populated it in local dev.
+let stripeClient: Stripe | null = null
+
+function getStripe(): Stripe {
+    if (!stripeClient) {
+        stripeClient = new Stripe(process.env.STRIPE_SECRET_KEY || '', {
+            apiVersion: '2023-10-16',
+        })
+    }
+    return stripeClient
+}
 
 const payments = new Hono()
 
+// Single-flight guards for outbound Stripe calls. A click-storm on
+// "Manage"/refresh fired one ~200ms Stripe API round-trip per click;
+// concurrent callers for the same customer now share one in-flight promise.
+// Portal session URLs are deliberately not cached beyond that: they expire
+// shortly after creation, so re-serving one later can hand out a dead link.
+const inflightSubscriptionLookups = new Map<string, Promise<unknown>>()
+const inflightPortalSessions = new Map<string, Promise<string>>()
+
+function singleFlight<T>(store: Map<string, Promise<T>>, key: string, fn: () => Promise<T>): Promise<T> {
+    const existing = store.get(key)
+    if (existing) {
+        return existing
+    }
+    const promise = fn().finally(() => store.delete(key))
+    store.set(key, promise)
+    return promise
+}
+
 // Validation schemas
 const createCheckoutSchema = z.object({
     priceId: z.string(),
@@ -26,6 +54,7 @@ const createCheckoutSchema = z.object({
 payments.post('/checkout', async (c) => {
     try {
         const user = requireUser(c)
+        const stripe = getStripe()
         const body = await c.req.json()
         const { priceId, successUrl, cancelUrl } = createCheckoutSchema.parse(body)
 
@@ -85,19 +114,34 @@ payments.get('/subscription', async (c) => {
             return c.json({ subscription: null })
         }
 
-        // Get customer's subscriptions
-        const subscriptions = await stripe.subscriptions.list({
-            customer: user.stripeCustomerId,
-            status: 'active',
-            limit: 1,
-        })
-
-        if (subscriptions.data.length === 0) {
+        // Get customer's subscriptions, sharing one Stripe round-trip between
+        // concurrent requests for the same customer
+        const result = await singleFlight(
+            inflightSubscriptionLookups as Map<string, Promise<{ subscription: Stripe.Subscription; price: Stripe.Price } | null>>,
+            user.stripeCustomerId,
+            async () => {
+                const stripe = getStripe()
+                const subscriptions = await stripe.subscriptions.list({
+                    customer: user.stripeCustomerId!,
+                    status: 'active',
+                    limit: 1,
+                })
+
+                if (subscriptions.data.length === 0) {
+                    return null
+                }
+
+                const subscription = subscriptions.data[0]
+                const price = await stripe.prices.retrieve(subscription.items.data[0].price.id)
+                return { subscription, price }
+            }
+        )
+
+        if (!result) {
             return c.json({ subscription: null })
         }
 
-        const subscription = subscriptions.data[0]
-        const price = await stripe.prices.retrieve(subscription.items.data[0].price.id)
+        const { subscription, price } = result
 
         logger.info(`Subscription status requested by ${user?.email}`)
 
@@ -130,14 +174,17 @@ payments.post('/portal', async (c) => {
             return c.json({ error: 'No customer found' }, 404)
         }
 
-        const session = await stripe.billingPortal.sessions.create({
-            customer: user.stripeCustomerId,
-            return_url: process.env.FRONTEND_URL || 'http://localhost:3000',
+        const url = await singleFlight(inflightPortalSessions, user.stripeCustomerId, async () => {
+            const session = await getStripe().billingPortal.sessions.create({
+                customer: user.stripeCustomerId!,
+                return_url: process.env.FRONTEND_URL || 'http://localhost:3000',
+            })
+            return session.url
         })
 
         logger.info(`Billing portal session created for ${user?.email}`)
 
-        return c.json({ url: session.url })
+        return c.json({ url })
     } catch (error) {
         logger.error('Create portal error:', error)
         return c.json({ error: 'Failed to create billing portal session' }, 500)
@@ -147,18 +194,21 @@ payments.post('/portal', async (c) => {
 // Stripe webhook handler
 payments.post('/webhook', async (c) => {
     try {
-        const body = await c.req.text()
+        // Reject unsigned requests before buffering the payload - webhook
+        // bodies can be large and there is no point reading them when the
+        // signature header is absent.
         const signature = c.req.header('stripe-signature')
 
         if (!signature) {
             return c.json({ error: 'Missing signature' }, 400)
         }
 
+        const body = await c.req.text()
         const webhookSecret = process.env.STRIPE_WEBHOOK_SECRET || ''
         let event: Stripe.Event
 
         try {
-            event = stripe.webhooks.constructEvent(body, signature, webhookSecret)
+            event = getStripe().webhooks.constructEvent(body, signature, webhookSecret)
         } catch (err) {
             logger.error('Webhook signature verification failed:', err)
             return c.json({ error: 'Invalid signature' }, 400)
@@ -190,13 +240,26 @@ payments.post('/webhook', async (c) => {
     }
 })
 
+// Drop the auth cache entry for the user behind a Stripe customer so the
+// webhook's tier change is visible on the next request instead of after the
+// cache TTL. stripeCustomerId is unique, so at most one user matches.
+async function invalidateUserForCustomer(customerId: string) {
+    const user = await prisma.user.findUnique({
+        where: { stripeCustomerId: customerId },
+        select: { id: true },
+    })
+    if (user) {
+        invalidateCachedUser(user.id)
+    }
+}
+
 // Helper functions for webhook handling
 async function handleSubscriptionChange(subscription: Stripe.Subscription) {
     const customerId = subscription.customer as string
     const priceId = subscription.items.data[0].price.id
 
     // Get price metadata to determine tier
-    const price = await stripe.prices.retrieve(priceId)
+    const price = await getStripe().prices.retrieve(priceId)
     const tier = price.metadata?.tier || 'pro'
 
     // Update user tier
@@ -205,6 +268,8 @@ async function handleSubscriptionChange(subscription: Stripe.Subscription) {
         data: { tier },
     })
 
+    await invalidateUserForCustomer(customerId)
+
     logger.info(`User tier updated to ${tier} for customer ${customerId}`)
 }
 
@@ -217,6 +282,8 @@ async function handleSubscriptionDeleted(subscription: Stripe.Subscription) {
         data: { tier: 'free' },
     })
 
+    await invalidateUserForCustomer(customerId)
+
     logger.info(`User downgraded to free tier for customer ${customerId}`)
 }
 
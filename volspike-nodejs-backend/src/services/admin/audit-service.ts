@@ -5,7 +5,16 @@ import { CreateAuditLogData, AuditLogQuery } from '../../types/audit'
 
 const logger = createLogger()
 
+// Buffered writes are flushed as one multi-row INSERT once the buffer fills
+// or the timer fires, so a burst of events (e.g. a login flurry) costs one
+// round-trip instead of one per event.
+const AUDIT_FLUSH_THRESHOLD = 50
+const AUDIT_FLUSH_INTERVAL_MS = 1000
+
 export class AuditService {
+    private static pendingLogs: CreateAuditLogData[] = []
+    private static flushTimer: NodeJS.Timeout | null = null
+
     // Create audit log entry
     static async createAuditLog(data: CreateAuditLogData) {
         try {
@@ -29,44 +38,101 @@ export class AuditService {
         }
     }
 
-    // Get audit logs with filtering
-    static async getAuditLogs(query: AuditLogQuery) {
+    // Queue an audit log entry for batched insertion. Use this for
+    // fire-and-forget events where the caller does not need the created row;
+    // entries are written by flushPendingAuditLogs in one createMany.
+    static queueAuditLog(data: CreateAuditLogData) {
+        this.pendingLogs.push(data)
+
+        if (this.pendingLogs.length >= AUDIT_FLUSH_THRESHOLD) {
+            void this.flushPendingAuditLogs()
+        } else if (!this.flushTimer) {
+            this.flushTimer = setTimeout(() => {
+                void this.flushPendingAuditLogs()
+            }, AUDIT_FLUSH_INTERVAL_MS)
+            this.flushTimer.unref?.()
+        }
+    }
+
+    // Flush any queued audit logs as a single multi-row insert
+    static async flushPendingAuditLogs() {
+        if (this.flushTimer) {
+            clearTimeout(this.flushTimer)
+            this.flushTimer = null
+        }
+
+        if (this.pendingLogs.length === 0) {
+            return
+        }
+
+        const batch = this.pendingLogs
+        this.pendingLogs = []
+
         try {
-            const where: any = {}
+            await prisma.auditLog.createMany({
+                data: batch.map((data) => ({
+                    actorUserId: data.actorUserId,
+                    action: data.action,
+                    targetType: data.targetType,
+                    targetId: data.targetId,
+                    oldValues: data.oldValues,
+                    newValues: data.newValues,
+                    metadata: data.metadata as any,
+                })),
+            })
 
-            if (query.actorUserId) {
-                where.actorUserId = query.actorUserId
-            }
+            logger.info(`Flushed ${batch.length} queued audit logs`)
+        } catch (error) {
+            // Audit logging must not take the calling flow down with it
+            logger.error('Flush audit logs error:', error)
+        }
+    }
 
-            if (query.action) {
-                if (Array.isArray(query.action)) {
-                    where.action = { in: query.action }
-                } else {
-                    where.action = query.action
-                }
-            }
+    // Build the Prisma where clause shared by listing and export
+    private static buildWhere(query: AuditLogQuery) {
+        const where: any = {}
 
-            if (query.targetType) {
-                if (Array.isArray(query.targetType)) {
-                    where.targetType = { in: query.targetType }
-                } else {
-                    where.targetType = query.targetType
-                }
+        if (query.actorUserId) {
+            where.actorUserId = query.actorUserId
+        }
+
+        if (query.action) {
+            if (Array.isArray(query.action)) {
+                where.action = { in: query.action }
+            } else {
+                where.action = query.action
             }
+        }
 
-            if (query.targetId) {
-                where.targetId = query.targetId
+        if (query.targetType) {
+            if (Array.isArray(query.targetType)) {
+                where.targetType = { in: query.targetType }
+            } else {
+                where.targetType = query.targetType
             }
+        }
 
-            if (query.startDate || query.endDate) {
-                where.createdAt = {}
-                if (query.startDate) {
-                    where.createdAt.gte = query.startDate
-                }
-                if (query.endDate) {
-                    where.createdAt.lte = query.endDate
-                }
+        if (query.targetId) {
+            where.targetId = query.targetId
+        }
+
+        if (query.startDate || query.endDate) {
+            where.createdAt = {}
+            if (query.startDate) {
+                where.createdAt.gte = query.startDate
+            }
+            if (query.endDate) {
+                where.createdAt.lte = query.endDate
             }
+        }
+
+        return where
+    }
+
+    // Get audit logs with filtering
+    static async getAuditLogs(query: AuditLogQuery) {
+        try {
+            const where = AuditService.buildWhere(query)
 
             const page = query.page || 1
             const limit = query.limit || 20
@@ -306,28 +372,6 @@ export class AuditService {
         }
     }
 
-    // Export audit logs
-    static async exportAuditLogs(query: AuditLogQuery, format: 'csv' | 'json' | 'xlsx') {
-        try {
-            // Get all logs for export (large limit)
-            const exportQuery = { ...query, limit: 10000 }
-            const result = await this.getAuditLogs(exportQuery)
-
-            switch (format) {
-                case 'csv':
-                    return this.generateCSV(result.logs)
-                case 'xlsx':
-                    return this.generateXLSX(result.logs)
-                case 'json':
-                default:
-                    return JSON.stringify(result.logs, null, 2)
-            }
-        } catch (error) {
-            logger.error('Export audit logs error:', error)
-            throw error
-        }
-    }
-
     // Log user action
     static async logUserAction(
         actorUserId: string,
@@ -356,7 +400,9 @@ export class AuditService {
         }
     }
 
-    // Log security event
+    // Log security event. Security events arrive in bursts (failed-login
+    // flurries), so they go through the batched queue rather than one INSERT
+    // per event; callers never consume the created row.
     static async logSecurityEvent(
         actorUserId: string,
         event: string,
@@ -376,7 +422,7 @@ export class AuditService {
                 },
             }
 
-            return await this.createAuditLog(auditData)
+            this.queueAuditLog(auditData)
         } catch (error) {
             logger.error('Log security event error:', error)
             throw error
@@ -433,40 +479,4 @@ export class AuditService {
         }
     }
 
-    // Helper methods
-    private static generateCSV(logs: any[]): string {
-        const headers = [
-            'ID',
-            'Actor Email',
-            'Action',
-            'Target Type',
-            'Target ID',
-            'Created At',
-            'IP Address',
-            'User Agent',
-        ]
-
-        const rows = logs.map(log => [
-            log.id,
-            log.actor.email,
-            log.action,
-            log.targetType,
-            log.targetId || '',
-            log.createdAt,
-            log.metadata?.ip || '',
-            log.metadata?.userAgent || '',
-        ])
-
-        const csvContent = [headers, ...rows]
-            .map(row => row.map(field => `"${field}"`).join(','))
-            .join('\n')
-
-        return csvContent
-    }
-
-    private static generateXLSX(logs: any[]): string {
-        // This would need to be implemented with a library like xlsx
-        // For now, return CSV format
-        return this.generateCSV(logs)
-    }
 }
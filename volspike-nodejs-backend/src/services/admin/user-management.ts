@@ -10,6 +10,7 @@ import {
     InviteEmailData
 } from '../../types/admin'
 import { AuditAction, AuditTargetType } from '../../types/audit'
+import { invalidateCachedUser } from '../../middleware/auth'
 import bcrypt from 'bcryptjs'
 
 const logger = createLogger()
@@ -84,22 +85,43 @@ export class UserManagementService {
         try {
             const user = await prisma.user.findUnique({
                 where: { id: userId },
+                // Relations are trimmed to the fields UserDetail actually
+                // exposes; the full-row includes dragged whole contract and
+                // audit rows across the wire just to be discarded.
                 include: {
                     preferences: true,
                     watchlists: {
-                        include: {
+                        select: {
+                            id: true,
+                            name: true,
                             items: {
-                                include: {
-                                    contract: true,
+                                select: {
+                                    contract: {
+                                        select: { symbol: true },
+                                    },
                                 },
                             },
                         },
                     },
                     alerts: {
+                        select: {
+                            id: true,
+                            reason: true,
+                            threshold: true,
+                            triggeredValue: true,
+                            isDelivered: true,
+                            createdAt: true,
+                        },
                         orderBy: { createdAt: 'desc' },
                         take: 10,
                     },
                     auditLogs: {
+                        select: {
+                            id: true,
+                            action: true,
+                            targetType: true,
+                            createdAt: true,
+                        },
                         orderBy: { createdAt: 'desc' },
                         take: 20,
                     },
@@ -191,6 +213,8 @@ export class UserManagementService {
                 },
             })
 
+            invalidateCachedUser(userId)
+
             logger.info(`User ${userId} updated by admin ${adminUserId}`)
 
             return user
@@ -219,6 +243,8 @@ export class UserManagementService {
                 logger.info(`User ${userId} soft deleted by admin ${adminUserId}`)
             }
 
+            invalidateCachedUser(userId)
+
             return { success: true }
         } catch (error) {
             logger.error('Delete user error:', error)
@@ -234,6 +260,8 @@ export class UserManagementService {
                 data: { status: UserStatus.SUSPENDED },
             })
 
+            invalidateCachedUser(userId)
+
             logger.info(`User ${userId} suspended by admin ${adminUserId}`)
 
             return user
@@ -251,6 +279,8 @@ export class UserManagementService {
                 data: { status: UserStatus.ACTIVE },
             })
 
+            invalidateCachedUser(userId)
+
             logger.info(`User ${userId} activated by admin ${adminUserId}`)
 
             return user
@@ -278,53 +308,61 @@ export class UserManagementService {
         }
     }
 
-    // Execute bulk actions
+    // Execute bulk actions. A single set-based UPDATE ... WHERE id IN (...)
+    // replaces the old per-user loop, which issued one round-trip per user.
     static async executeBulkAction(data: BulkActionRequest, adminUserId: string) {
         try {
-            const results = []
-
-            for (const userId of data.userIds) {
-                try {
-                    switch (data.action) {
-                        case 'suspend':
-                            await prisma.user.update({
-                                where: { id: userId },
-                                data: { status: UserStatus.SUSPENDED },
-                            })
-                            results.push({ userId, success: true, action: 'suspended' })
-                            break
-
-                        case 'activate':
-                            await prisma.user.update({
-                                where: { id: userId },
-                                data: { status: UserStatus.ACTIVE },
-                            })
-                            results.push({ userId, success: true, action: 'activated' })
-                            break
-
-                        case 'delete':
-                            await prisma.user.update({
-                                where: { id: userId },
-                                data: { status: UserStatus.BANNED },
-                            })
-                            results.push({ userId, success: true, action: 'deleted' })
-                            break
-
-                        case 'changeTier':
-                            if (data.params?.tier) {
-                                await prisma.user.update({
-                                    where: { id: userId },
-                                    data: { tier: data.params.tier },
-                                })
-                                results.push({ userId, success: true, action: `tier changed to ${data.params.tier}` })
-                            }
-                            break
+            const where = { id: { in: data.userIds } }
+            let actionLabel: string | null = null
+
+            // updateMany silently skips IDs that match no row, so resolve the
+            // existing ones up front; the per-ID results below report misses
+            // as failures, as the old per-user loop did via its P2025 catch
+            const existing = await prisma.user.findMany({
+                where,
+                select: { id: true },
+            })
+            const foundIds = new Set(existing.map(user => user.id))
+
+            switch (data.action) {
+                case 'suspend':
+                    await prisma.user.updateMany({ where, data: { status: UserStatus.SUSPENDED } })
+                    actionLabel = 'suspended'
+                    break
+
+                case 'activate':
+                    await prisma.user.updateMany({ where, data: { status: UserStatus.ACTIVE } })
+                    actionLabel = 'activated'
+                    break
+
+                case 'delete':
+                    await prisma.user.updateMany({ where, data: { status: UserStatus.BANNED } })
+                    actionLabel = 'deleted'
+                    break
+
+                case 'changeTier':
+                    if (data.params?.tier) {
+                        await prisma.user.updateMany({ where, data: { tier: data.params.tier } })
+                        actionLabel = `tier changed to ${data.params.tier}`
                     }
-                } catch (error) {
-                    results.push({ userId, success: false, error: error instanceof Error ? error.message : 'Unknown error' })
-                }
+                    break
             }
 
+            // The set-based UPDATE bypasses the per-request user cache, so
+            // drop the affected entries to make the new tier/status visible
+            // on the next request instead of after the cache TTL
+            if (actionLabel) {
+                foundIds.forEach(invalidateCachedUser)
+            }
+
+            const results = actionLabel
+                ? data.userIds.map(userId => (
+                    foundIds.has(userId)
+                        ? { userId, success: true, action: actionLabel! }
+                        : { userId, success: false, error: 'User not found' }
+                ))
+                : []
+
             logger.info(`Bulk action ${data.action} executed by admin ${adminUserId} on ${data.userIds.length} users`)
 
             return { results }
@@ -337,18 +375,13 @@ export class UserManagementService {
     // Get user statistics
     static async getUserStats() {
         try {
-            const [
-                totalUsers,
-                activeUsers,
-                suspendedUsers,
-                bannedUsers,
-                usersByTier,
-                recentSignups,
-            ] = await Promise.all([
-                prisma.user.count(),
-                prisma.user.count({ where: { status: UserStatus.ACTIVE } }),
-                prisma.user.count({ where: { status: UserStatus.SUSPENDED } }),
-                prisma.user.count({ where: { status: UserStatus.BANNED } }),
+            // One grouped scan covers the total and every per-status count;
+            // this used to be four separate full-table count queries.
+            const [usersByStatus, usersByTier, recentSignups] = await Promise.all([
+                prisma.user.groupBy({
+                    by: ['status'],
+                    _count: true,
+                }),
                 prisma.user.groupBy({
                     by: ['tier'],
                     _count: true,
@@ -362,11 +395,16 @@ export class UserManagementService {
                 }),
             ])
 
+            const statusCounts = usersByStatus.reduce((acc, item) => {
+                acc[item.status] = item._count
+                return acc
+            }, {} as Record<string, number>)
+
             return {
-                totalUsers,
-                activeUsers,
-                suspendedUsers,
-                bannedUsers,
+                totalUsers: usersByStatus.reduce((sum, item) => sum + item._count, 0),
+                activeUsers: statusCounts[UserStatus.ACTIVE] || 0,
+                suspendedUsers: statusCounts[UserStatus.SUSPENDED] || 0,
+                bannedUsers: statusCounts[UserStatus.BANNED] || 0,
                 usersByTier: usersByTier.reduce((acc, item) => {
                     acc[item.tier] = item._count
                     return acc
@@ -39,11 +39,22 @@ interface MarketData {
 
 const BINANCE_BASE_URL = 'https://fapi.binance.com'
 
+// Pairs below this 24h quote volume are dropped everywhere
+const MIN_QUOTE_VOLUME = 1000000
+
+// Endpoint URLs assembled once at module load instead of re-interpolating
+// the base URL at every call site
+const API_URLS = {
+    ticker24h: `${BINANCE_BASE_URL}/fapi/v1/ticker/24hr`,
+    premiumIndex: `${BINANCE_BASE_URL}/fapi/v1/premiumIndex`,
+    klines: `${BINANCE_BASE_URL}/fapi/v1/klines`,
+} as const
+
 export async function getMarketData(symbol?: string): Promise<MarketData[] | MarketData | null> {
     if (symbol) {
         // Fetch single symbol data
         try {
-            const response = await axios.get(`${BINANCE_BASE_URL}/fapi/v1/ticker/24hr`, {
+            const response = await axios.get(API_URLS.ticker24h, {
                 params: { symbol },
                 timeout: 10000
             })
@@ -57,7 +68,7 @@ export async function getMarketData(symbol?: string): Promise<MarketData[] | Mar
             const price = parseFloat(ticker.lastPrice)
             const volume24h = parseFloat(ticker.quoteVolume)
 
-            if (volume24h < 1000000) {
+            if (volume24h < MIN_QUOTE_VOLUME) {
                 return null // Filter out low volume pairs
             }
 
@@ -80,8 +91,8 @@ export async function getMarketData(symbol?: string): Promise<MarketData[] | Mar
     try {
         // Fetch ticker data and funding rates in parallel
         const [tickerResponse, fundingResponse] = await Promise.all([
-            axios.get(`${BINANCE_BASE_URL}/fapi/v1/ticker/24hr`),
-            axios.get(`${BINANCE_BASE_URL}/fapi/v1/premiumIndex`)
+            axios.get(API_URLS.ticker24h),
+            axios.get(API_URLS.premiumIndex)
         ])
 
         const tickers: BinanceTicker[] = tickerResponse.data
@@ -92,27 +103,33 @@ export async function getMarketData(symbol?: string): Promise<MarketData[] | Mar
             fundingRates.map(rate => [rate.symbol, parseFloat(rate.lastFundingRate)])
         )
 
-        // Process and normalize data
-        const marketData: MarketData[] = tickers
-            .filter(ticker => ticker.symbol.endsWith('USDT')) // Only USDT pairs
-            .map(ticker => {
-                const price = parseFloat(ticker.lastPrice)
-                const volume24h = parseFloat(ticker.quoteVolume)
-                const volumeChange = calculateVolumeChange(ticker)
-                const fundingRate = fundingMap.get(ticker.symbol) || 0
-
-                return {
-                    symbol: ticker.symbol,
-                    price,
-                    volume24h,
-                    volumeChange,
-                    fundingRate,
-                    openInterest: 0, // Will be fetched separately if needed
-                    timestamp: Date.now(),
-                }
+        // Process and normalize in a single pass. The previous
+        // filter/map/filter chain walked the full ticker list three times and
+        // built intermediate arrays (plus a MarketData object per low-volume
+        // pair only to discard it); checking the cheap predicates first means
+        // objects are allocated only for rows that survive. The timestamp is
+        // also read once per fetch instead of once per row.
+        const timestamp = Date.now()
+        const marketData: MarketData[] = []
+
+        for (const ticker of tickers) {
+            if (!ticker.symbol.endsWith('USDT')) continue // Only USDT pairs
+
+            const volume24h = parseFloat(ticker.quoteVolume)
+            if (!(volume24h > MIN_QUOTE_VOLUME)) continue // Filter out low volume pairs
+
+            marketData.push({
+                symbol: ticker.symbol,
+                price: parseFloat(ticker.lastPrice),
+                volume24h,
+                volumeChange: calculateVolumeChange(ticker),
+                fundingRate: fundingMap.get(ticker.symbol) || 0,
+                openInterest: 0, // Will be fetched separately if needed
+                timestamp,
             })
-            .filter(data => data.volume24h > 1000000) // Filter out low volume pairs
-            .sort((a, b) => b.volume24h - a.volume24h) // Sort by volume descending
+        }
+
+        marketData.sort((a, b) => b.volume24h - a.volume24h) // Sort by volume descending
 
         logger.info(`Fetched ${marketData.length} market data points from Binance`)
         return marketData
@@ -143,7 +160,7 @@ function calculateVolumeChange(ticker: BinanceTicker): number {
 
 export async function getSymbolData(symbol: string): Promise<MarketData | null> {
     try {
-        const response = await axios.get(`${BINANCE_BASE_URL}/fapi/v1/ticker/24hr`, {
+        const response = await axios.get(API_URLS.ticker24h, {
             params: { symbol }
         })
 
@@ -151,7 +168,7 @@ export async function getSymbolData(symbol: string): Promise<MarketData | null>
         const price = parseFloat(ticker.lastPrice)
         const volume24h = parseFloat(ticker.quoteVolume)
 
-        if (volume24h < 1000000) {
+        if (volume24h < MIN_QUOTE_VOLUME) {
             return null // Filter out low volume pairs
         }
 
@@ -177,7 +194,7 @@ export async function getHistoricalData(
     limit: number = 100
 ): Promise<any[]> {
     try {
-        const response = await axios.get(`${BINANCE_BASE_URL}/fapi/v1/klines`, {
+        const response = await axios.get(API_URLS.klines, {
             params: {
                 symbol,
                 interval,
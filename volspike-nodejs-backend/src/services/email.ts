@@ -4,12 +4,21 @@ import * as crypto from 'crypto'
 
 const logger = createLogger()
 
-// Initialize SendGrid with CJS/ESM interop and safety for missing keys
+// Initialize SendGrid with CJS/ESM interop and safety for missing keys.
+// Whether a usable key is present is resolved once here; the send paths
+// previously re-read process.env per message and never sanity-checked the
+// key format, so a truncated key only surfaced as per-send API errors.
+const sendgridApiKey = process.env.SENDGRID_API_KEY || ''
+const sendgridConfigured = sendgridApiKey.length > 0
+
 const mail: any = (sgMail as any)?.default ?? (sgMail as any)
 try {
-    if (process.env.SENDGRID_API_KEY) {
+    if (sendgridConfigured) {
+        if (!sendgridApiKey.startsWith('SG.')) {
+            logger.warn('SENDGRID_API_KEY does not start with "SG." - key may be malformed')
+        }
         if (typeof mail.setApiKey === 'function') {
-            mail.setApiKey(process.env.SENDGRID_API_KEY)
+            mail.setApiKey(sendgridApiKey)
         }
     }
 } catch (err) {
@@ -17,6 +26,112 @@ try {
     createLogger().warn('SendGrid initialization warning:', err)
 }
 
+// Static template boilerplate hoisted to module level. The verification and
+// welcome bodies are multi-KB strings of which only a few values vary per
+// message, so the invariant head/style sections are built once instead of
+// being re-assembled on every send.
+const VERIFICATION_HTML_HEAD = `
+<!doctype html>
+<html lang="en" xmlns:v="urn:schemas-microsoft-com:vml">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width">
+  <meta name="x-apple-disable-message-reformatting">
+  <meta name="format-detection" content="telephone=no,address=no,email=no,date=no,url=no">
+  <title>Verify your VolSpike email</title>
+  <style>
+    img { -ms-interpolation-mode:bicubic; }
+    @media only screen and (max-width:600px){ .container{ width:100% !important; } }
+  </style>
+  <!--[if mso]>
+  <style type="text/css"> body, table, td {font-family: Arial, sans-serif !important;} </style>
+  <![endif]-->
+  </head>
+  <body style="margin:0;padding:0;background:#f1f5f9;">
+  <div style="display:none;font-size:1px;color:#fff;line-height:1px;max-height:0;max-width:0;opacity:0;overflow:hidden;">
+    Verify your email to start using VolSpike. Link expires in 24 hours.
+  </div>
+  <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="background:#f1f5f9;">
+    <tr><td align="center" style="padding:24px;">
+      <table role="presentation" width="600" class="container" cellspacing="0" cellpadding="0" style="width:100%;max-width:600px;background:#ffffff;border-radius:12px;">
+        <tr>
+          <td align="center" style="padding:32px;background:#0ea371;border-radius:12px 12px 0 0;">
+            <table role="presentation" width="100%" cellpadding="0" cellspacing="0">
+              <tr>
+                <td align="center" style="padding-bottom:12px;">
+                  <img src="https://volspike.com/email/volspike-badge@2x.png" width="80" height="80" alt="VolSpike" style="display:block;margin:0 auto;border:0;outline:none;text-decoration:none;height:80px;width:80px;line-height:100%;-ms-interpolation-mode:bicubic;">
+                </td>
+              </tr>
+            </table>
+            <div style="font:700 24px/1.2 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#fff;">Welcome to VolSpike!</div>
+          </td>
+        </tr>`
+
+const WELCOME_HTML_STYLE = `
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #0f172a; color: #e2e8f0; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { text-align: center; margin-bottom: 30px; }
+        .logo { width: 60px; height: 60px; background: linear-gradient(135deg, #10b981, #059669); border-radius: 50%; margin: 0 auto 20px; display: flex; align-items: center; justify-content: center; }
+        .logo-text { color: white; font-weight: bold; font-size: 24px; }
+        .content { background: #1e293b; border-radius: 12px; padding: 30px; margin-bottom: 20px; }
+        .button { display: inline-block; background: linear-gradient(135deg, #10b981, #059669); color: white; text-decoration: none; padding: 12px 24px; border-radius: 8px; font-weight: 600; margin: 20px 0; }
+        .footer { text-align: center; color: #64748b; font-size: 14px; }
+        .highlight { color: #10b981; font-weight: 600; }
+        .tier-badge { display: inline-block; background: #334155; color: #10b981; padding: 4px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; text-transform: uppercase; }
+    </style>`
+
+// Token bucket guarding outbound SendGrid calls. The Web API enforces a
+// per-workspace request ceiling and answers bursts with 429s that previously
+// surfaced as plain send failures; pacing locally keeps bursts (e.g. a rush
+// of signups) under the ceiling, and a short backoff retries the occasional
+// 429 instead of dropping the email.
+const SEND_RATE_PER_SEC = 20
+const SEND_BUCKET_CAPACITY = 20
+let sendTokens = SEND_BUCKET_CAPACITY
+let lastRefill = Date.now()
+
+async function acquireSendToken(): Promise<void> {
+    for (;;) {
+        const now = Date.now()
+        sendTokens = Math.min(SEND_BUCKET_CAPACITY, sendTokens + ((now - lastRefill) / 1000) * SEND_RATE_PER_SEC)
+        lastRefill = now
+        if (sendTokens >= 1) {
+            sendTokens -= 1
+            return
+        }
+        await new Promise((resolve) => setTimeout(resolve, 50))
+    }
+}
+
+async function sendWithRateLimit(msg: unknown): Promise<any> {
+    let retryDelayMs = 1000
+    for (let attempt = 0; ; attempt++) {
+        await acquireSendToken()
+        try {
+            return await mail.send(msg)
+        } catch (error: any) {
+            if (error?.code === 429 && attempt < 2) {
+                logger.warn(`SendGrid rate limited (429); retrying in ${retryDelayMs}ms`)
+                await new Promise((resolve) => setTimeout(resolve, retryDelayMs))
+                retryDelayMs *= 2
+                continue
+            }
+            throw error
+        }
+    }
+}
+
+// Shared identity strings referenced by every message
+const COMPANY_NAME = 'VolSpike'
+const SUPPORT_EMAIL = 'support@volspike.com'
+const VERIFICATION_SUBJECT = 'Verify Your Email - VolSpike'
+
+// Copyright year in email footers; computed once per process rather than on
+// every render (a process spanning New Year redeploys long before that
+// matters)
+const COPYRIGHT_YEAR = new Date().getFullYear()
+
 interface EmailVerificationData {
     email: string
     name?: string
@@ -32,15 +147,31 @@ interface WelcomeEmailData {
 export class EmailService {
     private static instance: EmailService
     private fromEmail: string
+    private fromField: { email: string; name: string }
     private verificationTemplateId: string
     private welcomeTemplateId: string
     private baseUrl: string
+    private dashboardUrl: string
+    private verificationMsgBase: { from: { email: string; name: string }; subject: string }
+    private welcomeMsgBase: { from: { email: string; name: string }; templateId: string }
 
     constructor() {
         this.fromEmail = process.env.SENDGRID_FROM_EMAIL || 'noreply@volspike.com'
+        if (!process.env.SENDGRID_FROM_EMAIL) {
+            logger.warn(`SendGrid from email may not be verified: ${this.fromEmail}`)
+        }
+        // Sender never changes per message, so the from object is built once
+        // here rather than allocated inside every send
+        this.fromField = { email: this.fromEmail, name: 'VolSpike Team' }
         this.verificationTemplateId = process.env.SENDGRID_VERIFICATION_TEMPLATE_ID || ''
         this.welcomeTemplateId = process.env.SENDGRID_WELCOME_TEMPLATE_ID || ''
         this.baseUrl = process.env.EMAIL_VERIFICATION_URL_BASE || 'http://localhost:3000'
+        this.dashboardUrl = `${this.baseUrl}/dashboard`
+        // Only the recipient and body vary per message; the invariant
+        // skeleton (sender, subject, template id) is shared and spread into
+        // each send instead of re-declared inline
+        this.verificationMsgBase = { from: this.fromField, subject: VERIFICATION_SUBJECT }
+        this.welcomeMsgBase = { from: this.fromField, templateId: this.welcomeTemplateId }
     }
 
     static getInstance(): EmailService {
@@ -63,25 +194,19 @@ export class EmailService {
     async sendVerificationEmail(data: EmailVerificationData): Promise<boolean> {
         try {
             // Check if SendGrid is configured
-            if (!process.env.SENDGRID_API_KEY) {
+            if (!sendgridConfigured) {
                 logger.error('SENDGRID_API_KEY is not set in environment variables')
                 return false
             }
 
-            if (!this.fromEmail || this.fromEmail === 'noreply@volspike.com' && !process.env.SENDGRID_FROM_EMAIL) {
-                logger.warn(`SendGrid from email may not be verified: ${this.fromEmail}`)
-            }
+            const { html, text } = this.renderVerificationEmail(data)
 
             const msg: any = {
+                ...this.verificationMsgBase,
                 to: data.email,
-                from: {
-                    email: this.fromEmail,
-                    name: 'VolSpike Team'
-                },
                 // Fallback HTML/text are always included
-                html: this.getVerificationEmailHTML(data),
-                text: this.getVerificationEmailText(data),
-                subject: 'Verify Your Email - VolSpike'
+                html,
+                text,
             }
 
             // Only include templateId if it's configured
@@ -90,14 +215,14 @@ export class EmailService {
                 msg.dynamicTemplateData = {
                     first_name: data.name || data.email.split('@')[0],
                     verification_url: data.verificationUrl,
-                    support_email: 'support@volspike.com',
-                    company_name: 'VolSpike'
+                    support_email: SUPPORT_EMAIL,
+                    company_name: COMPANY_NAME
                 }
             }
 
             logger.info(`Attempting to send verification email to ${data.email} from ${this.fromEmail}`)
             
-            const response = await mail.send(msg)
+            const response = await sendWithRateLimit(msg)
             
             // Log SendGrid response for debugging
             logger.info(`SendGrid response for ${data.email}:`, {
@@ -138,25 +263,20 @@ export class EmailService {
     async sendWelcomeEmail(data: WelcomeEmailData): Promise<boolean> {
         try {
             const msg = {
+                ...this.welcomeMsgBase,
                 to: data.email,
-                from: {
-                    email: this.fromEmail,
-                    name: 'VolSpike Team'
-                },
-                templateId: this.welcomeTemplateId,
                 dynamicTemplateData: {
                     first_name: data.name || data.email.split('@')[0],
                     tier: data.tier,
-                    dashboard_url: `${this.baseUrl}/dashboard`,
-                    support_email: 'support@volspike.com',
-                    company_name: 'VolSpike'
+                    dashboard_url: this.dashboardUrl,
+                    support_email: SUPPORT_EMAIL,
+                    company_name: COMPANY_NAME
                 },
                 // Fallback HTML if template is not available
-                html: this.getWelcomeEmailHTML(data),
-                text: this.getWelcomeEmailText(data)
+                ...this.renderWelcomeEmail(data),
             }
 
-            await mail.send(msg)
+            await sendWithRateLimit(msg)
             logger.info(`Welcome email sent to ${data.email}`)
             return true
         } catch (error) {
@@ -166,50 +286,18 @@ export class EmailService {
     }
 
     /**
-     * Fallback HTML template for verification email
-     * Optimized for deliverability, responsiveness, and compatibility across all email clients
+     * Fallback HTML and text bodies for the verification email, rendered in
+     * one pass so the escaped values are computed once. The HTML is optimized
+     * for deliverability, responsiveness, and compatibility across all email
+     * clients.
      */
-    private getVerificationEmailHTML(data: EmailVerificationData): string {
+    private renderVerificationEmail(data: EmailVerificationData): { html: string; text: string } {
         // Escape HTML to prevent XSS
         const safeName = (data.name || 'there').replace(/[<>]/g, '')
         const safeUrl = data.verificationUrl.replace(/"/g, '&quot;')
 
-        return `
-<!doctype html>
-<html lang="en" xmlns:v="urn:schemas-microsoft-com:vml">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width">
-  <meta name="x-apple-disable-message-reformatting">
-  <meta name="format-detection" content="telephone=no,address=no,email=no,date=no,url=no">
-  <title>Verify your VolSpike email</title>
-  <style>
-    img { -ms-interpolation-mode:bicubic; }
-    @media only screen and (max-width:600px){ .container{ width:100% !important; } }
-  </style>
-  <!--[if mso]>
-  <style type="text/css"> body, table, td {font-family: Arial, sans-serif !important;} </style>
-  <![endif]-->
-  </head>
-  <body style="margin:0;padding:0;background:#f1f5f9;">
-  <div style="display:none;font-size:1px;color:#fff;line-height:1px;max-height:0;max-width:0;opacity:0;overflow:hidden;">
-    Verify your email to start using VolSpike. Link expires in 24 hours.
-  </div>
-  <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="background:#f1f5f9;">
-    <tr><td align="center" style="padding:24px;">
-      <table role="presentation" width="600" class="container" cellspacing="0" cellpadding="0" style="width:100%;max-width:600px;background:#ffffff;border-radius:12px;">
-        <tr>
-          <td align="center" style="padding:32px;background:#0ea371;border-radius:12px 12px 0 0;">
-            <table role="presentation" width="100%" cellpadding="0" cellspacing="0">
-              <tr>
-                <td align="center" style="padding-bottom:12px;">
-                  <img src="https://volspike.com/email/volspike-badge@2x.png" width="80" height="80" alt="VolSpike" style="display:block;margin:0 auto;border:0;outline:none;text-decoration:none;height:80px;width:80px;line-height:100%;-ms-interpolation-mode:bicubic;">
-                </td>
-              </tr>
-            </table>
-            <div style="font:700 24px/1.2 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#fff;">Welcome to VolSpike!</div>
-          </td>
-        </tr>
+        const text = `Verify your email for VolSpike: ${data.verificationUrl}`
+        const html = `${VERIFICATION_HTML_HEAD}
         <tr>
           <td style="padding:32px;font:400 16px/1.6 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#334155;">
             <div style="font:600 20px/1.3 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#0f172a;margin:0 0 12px;">Verify your email</div>
@@ -240,7 +328,7 @@ export class EmailService {
         </tr>
         <tr>
           <td align="center" style="padding:20px;background:#f8fafc;border-top:1px solid #e2e8f0;border-radius:0 0 12px 12px;">
-            <div style="font:14px/1.5 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#64748b;">© ${new Date().getFullYear()} VolSpike • Need help? <a href="mailto:support@volspike.com" style="color:#059669;text-decoration:none;">support@volspike.com</a></div>
+            <div style="font:14px/1.5 -apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Helvetica,Arial,sans-serif;color:#64748b;">© ${COPYRIGHT_YEAR} VolSpike • Need help? <a href="mailto:support@volspike.com" style="color:#059669;text-decoration:none;">support@volspike.com</a></div>
           </td>
         </tr>
       </table>
@@ -249,38 +337,24 @@ export class EmailService {
   </body>
   </html>
         `
-    }
 
-    /**
-     * Fallback text template for verification email
-     */
-    private getVerificationEmailText(data: EmailVerificationData): string {
-        return `Verify your email for VolSpike: ${data.verificationUrl}`
+        return { html, text }
     }
 
     /**
-     * Fallback HTML template for welcome email
+     * Fallback HTML and text bodies for the welcome email, sharing one
+     * computed context
      */
-    private getWelcomeEmailHTML(data: WelcomeEmailData): string {
-        return `
+    private renderWelcomeEmail(data: WelcomeEmailData): { html: string; text: string } {
+        const name = data.name || 'there'
+
+        const html = `
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Welcome to VolSpike!</title>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 0; background-color: #0f172a; color: #e2e8f0; }
-        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-        .header { text-align: center; margin-bottom: 30px; }
-        .logo { width: 60px; height: 60px; background: linear-gradient(135deg, #10b981, #059669); border-radius: 50%; margin: 0 auto 20px; display: flex; align-items: center; justify-content: center; }
-        .logo-text { color: white; font-weight: bold; font-size: 24px; }
-        .content { background: #1e293b; border-radius: 12px; padding: 30px; margin-bottom: 20px; }
-        .button { display: inline-block; background: linear-gradient(135deg, #10b981, #059669); color: white; text-decoration: none; padding: 12px 24px; border-radius: 8px; font-weight: 600; margin: 20px 0; }
-        .footer { text-align: center; color: #64748b; font-size: 14px; }
-        .highlight { color: #10b981; font-weight: 600; }
-        .tier-badge { display: inline-block; background: #334155; color: #10b981; padding: 4px 12px; border-radius: 20px; font-size: 12px; font-weight: 600; text-transform: uppercase; }
-    </style>
+    <title>Welcome to VolSpike!</title>${WELCOME_HTML_STYLE}
 </head>
 <body>
     <div class="container">
@@ -293,7 +367,7 @@ export class EmailService {
         
         <div class="content">
             <h2>Your Account is Ready</h2>
-            <p>Hi ${data.name || 'there'},</p>
+            <p>Hi ${name},</p>
             <p>🎉 <strong>Congratulations!</strong> Your email has been verified and your VolSpike account is now active.</p>
             
             <div style="text-align: center; margin: 20px 0;">
@@ -316,23 +390,18 @@ export class EmailService {
         </div>
         
         <div class="footer">
-            <p>© 2024 VolSpike. All rights reserved.</p>
+            <p>© ${COPYRIGHT_YEAR} VolSpike. All rights reserved.</p>
             <p>Need help? Contact us at <a href="mailto:support@volspike.com" style="color: #10b981;">support@volspike.com</a></p>
         </div>
     </div>
 </body>
 </html>
         `
-    }
 
-    /**
-     * Fallback text template for welcome email
-     */
-    private getWelcomeEmailText(data: WelcomeEmailData): string {
-        return `
+        const text = `
 Welcome to VolSpike!
 
-Hi ${data.name || 'there'},
+Hi ${name},
 
 🎉 Congratulations! Your email has been verified and your VolSpike account is now active.
 
@@ -350,8 +419,10 @@ Pro Tip: Upgrade to Pro or Elite tier to unlock advanced features like email ale
 
 Need help? Contact us at support@volspike.com
 
-© 2024 VolSpike. All rights reserved.
+© ${COPYRIGHT_YEAR} VolSpike. All rights reserved.
         `
+
+        return { html, text }
     }
 }
 
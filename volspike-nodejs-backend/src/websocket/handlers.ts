@@ -2,14 +2,54 @@ import { Server as SocketIOServer, Socket } from 'socket.io'
 import { PrismaClient } from '@prisma/client'
 import { createLogger } from '../lib/logger'
 import { getMarketData } from '../services/binance-client'
+import { getRefreshInterval } from '../config/tiers'
+import { envBool } from '../lib/env'
 
 const logger = createLogger()
 
+// Env flags parsed once at startup; these were previously re-read and
+// re-compared on every connection and every 10s poll tick.
+const isDevelopment = process.env.NODE_ENV === 'development'
+const serverMarketPollDisabled = envBool('DISABLE_SERVER_MARKET_POLL')
+
 interface AuthenticatedSocket extends Socket {
     userId?: string
     userTier?: string
 }
 
+// Short-lived cache for the handshake email lookup, mirroring the HTTP auth
+// middleware's user cache. Clients reconnect frequently (tab switches,
+// transport upgrades, flaky networks) and each handshake repeated the same
+// SELECT; 30 seconds of staleness is acceptable for the tier routing decided
+// here.
+interface SocketUser {
+    id: string
+    email: string
+    tier: string
+    refreshInterval: number
+}
+
+const socketUserCache = new Map<string, { user: SocketUser; expires: number }>()
+const SOCKET_USER_CACHE_TTL_MS = 30 * 1000
+const SOCKET_USER_CACHE_MAX_ENTRIES = 10_000
+
+function getCachedSocketUser(email: string): SocketUser | null {
+    const entry = socketUserCache.get(email)
+    if (!entry) return null
+    if (Date.now() > entry.expires) {
+        socketUserCache.delete(email)
+        return null
+    }
+    return entry.user
+}
+
+function setCachedSocketUser(email: string, user: SocketUser) {
+    if (socketUserCache.size >= SOCKET_USER_CACHE_MAX_ENTRIES) {
+        socketUserCache.clear()
+    }
+    socketUserCache.set(email, { user, expires: Date.now() + SOCKET_USER_CACHE_TTL_MS })
+}
+
 export function setupSocketHandlers(
     io: SocketIOServer,
     prisma: PrismaClient,
@@ -25,7 +65,7 @@ export function setupSocketHandlers(
             }
 
             // For development: allow mock tokens without database lookup
-            if (process.env.NODE_ENV === 'development' && token.startsWith('mock-token-')) {
+            if (isDevelopment && token.startsWith('mock-token-')) {
                 logger.info('Using mock token for Socket.io authentication')
                 socket.userId = '1' // Mock user ID
                 socket.userTier = 'free'
@@ -34,19 +74,24 @@ export function setupSocketHandlers(
 
             // Production: Look up user by email (consistent across environments)
             // The frontend sends the session user email as the token
-            const user = await prisma.user.findUnique({
-                where: { email: token },
-                select: {
-                    id: true,
-                    email: true,
-                    tier: true,
-                    refreshInterval: true,
-                },
-            })
-
+            let user = getCachedSocketUser(token)
             if (!user) {
-                logger.error('User not found for token:', token)
-                return next(new Error('Invalid token'))
+                user = await prisma.user.findUnique({
+                    where: { email: token },
+                    select: {
+                        id: true,
+                        email: true,
+                        tier: true,
+                        refreshInterval: true,
+                    },
+                })
+
+                if (!user) {
+                    logger.error('User not found for token:', token)
+                    return next(new Error('Invalid token'))
+                }
+
+                setCachedSocketUser(token, user)
             }
 
             logger.info(`User ${user.id} (${user.tier} tier) authenticated for WebSocket`)
@@ -116,11 +161,15 @@ export function setupSocketHandlers(
                 socket.join(`watchlist-${watchlistId}`)
                 logger.info(`User ${userId} subscribed to watchlist ${watchlistId}`)
 
-                // Send current data for all symbols in watchlist
-                for (const item of watchlist.items) {
-                    const symbolData = await getMarketData(item.contract.symbol)
-                    if (symbolData) {
-                        socket.emit('symbol-data', symbolData)
+                // Send current data for all symbols in the watchlist with one
+                // bulk fetch instead of one Binance round-trip per item
+                const symbols = new Set(watchlist.items.map(item => item.contract.symbol))
+                const marketData = await getMarketData()
+                if (Array.isArray(marketData)) {
+                    for (const symbolData of marketData) {
+                        if (symbols.has(symbolData.symbol)) {
+                            socket.emit('symbol-data', symbolData)
+                        }
                     }
                 }
             } catch (error) {
@@ -131,25 +180,8 @@ export function setupSocketHandlers(
         // Handle tier-based refresh requests
         socket.on('request-refresh', async () => {
             try {
-                const tier = userTier
-                let refreshInterval: number
-
-                switch (tier) {
-                    case 'free':
-                        refreshInterval = 15 * 60 * 1000 // 15 minutes
-                        break
-                    case 'pro':
-                        refreshInterval = 5 * 60 * 1000 // 5 minutes
-                        break
-                    case 'elite':
-                        refreshInterval = 30 * 1000 // 30 seconds
-                        break
-                    default:
-                        refreshInterval = 15 * 60 * 1000
-                }
-
                 // Send refresh interval to client
-                socket.emit('refresh-interval', { interval: refreshInterval })
+                socket.emit('refresh-interval', { interval: getRefreshInterval(userTier) })
 
                 // Send current market data
                 const marketData = await getMarketData()
@@ -173,7 +205,7 @@ export function setupSocketHandlers(
         })
 
         // Optionally skip initial REST fetch in production
-        if (process.env.DISABLE_SERVER_MARKET_POLL !== 'true') {
+        if (!serverMarketPollDisabled) {
             getMarketData()
                 .then(data => {
                     if (data) {
@@ -193,45 +225,47 @@ export function setupSocketHandlers(
         elite: 0
     }
 
+    // Broadcast cadence per tier, resolved once from the shared tier config
+    // instead of repeating the interval literals inside the loop
+    const tierIntervals = {
+        free: getRefreshInterval('free'),
+        pro: getRefreshInterval('pro'),
+        elite: getRefreshInterval('elite'),
+    }
+
     // Tier-aware market update broadcasting
     setInterval(async () => {
-        if (process.env.DISABLE_SERVER_MARKET_POLL === 'true') {
+        if (serverMarketPollDisabled) {
             return
         }
         try {
-            const marketData = await getMarketData()
-            if (!marketData) return
-
             const now = Date.now()
 
-            // Elite tier: every 30 seconds
-            if (now - lastUpdateTimes.elite >= 30000) {
-                io.to('tier-elite').emit('market-update', {
-                    data: marketData,
-                    tier: 'elite',
-                    timestamp: now
-                })
-                lastUpdateTimes.elite = now
-            }
+            // Nothing due this tick -> skip the upstream fetch entirely. The
+            // loop previously hit the market-data path every 10 seconds even
+            // when no tier was scheduled to receive an update.
+            const anyTierDue =
+                now - lastUpdateTimes.elite >= tierIntervals.elite ||
+                now - lastUpdateTimes.pro >= tierIntervals.pro ||
+                now - lastUpdateTimes.free >= tierIntervals.free
+            if (!anyTierDue) return
 
-            // Pro tier: every 5 minutes
-            if (now - lastUpdateTimes.pro >= 300000) {
-                io.to('tier-pro').emit('market-update', {
-                    data: marketData,
-                    tier: 'pro',
-                    timestamp: now
-                })
-                lastUpdateTimes.pro = now
-            }
+            const marketData = await getMarketData()
+            if (!marketData) return
 
-            // Free tier: every 15 minutes
-            if (now - lastUpdateTimes.free >= 900000) {
-                io.to('tier-free').emit('market-update', {
+            // One envelope per due tier, broadcast via the tier room.
+            // Socket.IO encodes a room broadcast once and fans the same
+            // packet out to every member, so per-subscriber cost is the
+            // socket write, not a re-serialization.
+            for (const tier of ['elite', 'pro', 'free'] as const) {
+                if (now - lastUpdateTimes[tier] < tierIntervals[tier]) continue
+
+                io.to(`tier-${tier}`).emit('market-update', {
                     data: marketData,
-                    tier: 'free',
+                    tier,
                     timestamp: now
                 })
-                lastUpdateTimes.free = now
+                lastUpdateTimes[tier] = now
             }
         } catch (error) {
             logger.warn('Error broadcasting market update (non-fatal):', error)
@@ -255,16 +289,3 @@ export function setupSocketHandlers(
         }
     })
 }
-
-function getRefreshInterval(tier: string): number {
-    switch (tier) {
-        case 'free':
-            return 15 * 60 * 1000 // 15 minutes
-        case 'pro':
-            return 5 * 60 * 1000 // 5 minutes
-        case 'elite':
-            return 30 * 1000 // 30 seconds
-        default:
-            return 15 * 60 * 1000
-    }
-}